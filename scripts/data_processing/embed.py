@@ -35,7 +35,6 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from core.config import CFG
-from core.index import Indexer  # updated indexer supports fresh/append/ocr-only
 
 
 def _qdrant_ready(url: str, timeout_s: float = 3.0) -> bool:
@@ -72,6 +71,8 @@ def parse_args() -> argparse.Namespace:
                    help="Chunk overlap (chars)")
     p.add_argument("--extract-dir", type=str, default=str(CFG.extract_dir),
                    help="Where PDF files are located")
+    p.add_argument("--workers", type=int, default=None,
+                   help="PDF extraction processes (default: CPU count - 1; 1 = in-process)")
     p.add_argument("--no-health-check", action="store_true",
                    help="Skip Qdrant /readyz check")
     p.add_argument("--verbose", "-v", action="store_true",
@@ -80,6 +81,10 @@ def parse_args() -> argparse.Namespace:
 
 
 def main():
+    # Imported here, not at module level: spawned extraction workers re-import
+    # this script as __mp_main__ and must not pull in torch/qdrant with it
+    from core.index import Indexer  # updated indexer supports fresh/append/ocr-only
+
     args = parse_args()
 
     # Logging
@@ -124,7 +129,7 @@ def main():
             fresh = (args.mode == "fresh")
             print(f"🏗️ Mode: {'fresh (recreate collection)' if fresh else 'append (keep collection)'}")
             indexer = Indexer(CFG, fresh=fresh)
-            indexer.build(extract_dir=extract_dir)
+            indexer.build(extract_dir=extract_dir, workers=args.workers)
 
     except KeyboardInterrupt:
         print("\n🛑 Interrupted by user.")
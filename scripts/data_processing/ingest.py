@@ -25,7 +25,7 @@ import subprocess
 import sys
 
 from core.config import CFG
-from core.io import ZipIngestor, ExcelCleaner
+from core.io import ZipIngestor, ExcelCleaner, iter_files
 
 def copy_loose_files() -> int:
     """
@@ -63,6 +63,11 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Skip Excel metadata cleaning",
     )
+    p.add_argument(
+        "--processes",
+        action="store_true",
+        help="Extract ZIPs in worker processes instead of threads (CPU-bound, deflate-heavy corpora)",
+    )
     p.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -87,7 +92,7 @@ def main():
     logging.info("📦 Starting ingestion pipeline")
     print("📦 Extracting ZIPs (recursive) ...")
     ingestor = ZipIngestor()
-    files_from_zip = ingestor.run()
+    files_from_zip = ingestor.run(processes=args.processes)
     print(f"   ➜ extracted/analyzed from zips: {files_from_zip}")
     logging.info(f"Extracted/analyzed {files_from_zip} files from ZIP archives")
 
@@ -110,7 +115,7 @@ def main():
             print(f"   ➜ Excel cleaning failed: {e}")
 
     # Summary: how many PDFs are ready
-    pdfs = sorted(CFG.extract_dir.rglob("*.pdf"))
+    pdfs = sorted(iter_files(CFG.extract_dir, ".pdf"))
     print(f"\n✅ Ready for embedding: {len(pdfs)} PDFs in {CFG.extract_dir}")
     logging.info(f"Ready for embedding: {len(pdfs)} PDFs")
 
@@ -109,7 +109,7 @@ class UnifiedDocumentProcessor:
             return 0
 
         reg_loader = PDFLoader(use_ocr=False)
-        ocr_loader = PDFLoader(use_ocr=True)
+        ocr_loader = PDFLoader(use_ocr=True, ocr_workers=CFG.ocr_workers, ocr_processes=CFG.ocr_processes)
 
         successful = 0
         for i, pdf in enumerate(pdf_files, start=1):
@@ -140,6 +140,7 @@ class UnifiedDocumentProcessor:
                     print(f"    ⚠️ No text extracted (OCR {dt:.1f}s)")
             except Exception as e:
                 print(f"    ❌ Error: {e}")
+        ocr_loader.close()
 
         self.stats["pdf_regular"]["files"] = len(pdf_files)
         self.stats["pdf_ocr"]["files"] = len(pdf_files)
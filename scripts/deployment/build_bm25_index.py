@@ -131,7 +131,7 @@ def main():
     index.build_index(documents)
     
     # Save index
-    output_path = CFG.state_dir / "bm25_index.pkl"
+    output_path = CFG.state_dir / "bm25_index"
     print()
     print(f"💾 Saving index to {output_path}...")
     index.save(output_path)
@@ -143,7 +143,8 @@ def main():
     print("=" * 70)
     print(f"📁 Location: {output_path}")
     print(f"📊 Documents indexed: {len(documents)}")
-    print(f"💾 File size: {output_path.stat().st_size / 1024:.1f} KB")
+    index_size = sum(p.stat().st_size for p in output_path.iterdir())
+    print(f"💾 Index size: {index_size / 1024:.1f} KB")
     print()
     print("🎉 Hybrid search is now ready to use!")
     print()
@@ -201,13 +201,20 @@ class ProductionDeployer:
                 self.log_step("  Collection: NOT FOUND", "WARNING")
                 self.results["checks"]["collection_points"] = 0
             
-            # Check metadata
-            import pandas as pd
-            df = pd.read_excel("data/metadata/cleaned_metadata.xlsx")
-            self.log_step(f"  Metadata: {len(df)} rows", "SUCCESS")
-            self.results["checks"]["metadata_rows"] = len(df)
+            # Check metadata (row count only; streamed without building a DataFrame)
+            from openpyxl import load_workbook
+            wb = load_workbook("data/metadata/cleaned_metadata.xlsx", read_only=True)
+            try:
+                metadata_rows = sum(
+                    1 for row in wb.active.iter_rows(min_row=2, values_only=True)
+                    if any(v is not None for v in row)
+                )
+            finally:
+                wb.close()
+            self.log_step(f"  Metadata: {metadata_rows} rows", "SUCCESS")
+            self.results["checks"]["metadata_rows"] = metadata_rows
             
-            return has_collection and len(df) > 0
+            return has_collection and metadata_rows > 0
             
         except Exception as e:
             self.log_step(f"  Health check failed: {e}", "FAILURE")
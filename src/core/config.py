@@ -1,5 +1,6 @@
 # core/config.py
 from __future__ import annotations
+from functools import lru_cache
 from pathlib import Path
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -17,28 +18,56 @@ class AppConfig(BaseSettings):
     logs_dir:     Path = ROOT / "data" / "logs"
     state_dir:    Path = ROOT / "data" / "state"
 
+    # fastText language-ID model for ingest (optional; langdetect is used without it)
+    lid_model_path: Path = ROOT / "data" / "models" / "lid.176.ftz"
+
     # If you ever change the filename, the UI/parse step will stay in sync via this:
     metadata_filename: str = "cleaned_metadata.xlsx"
 
+    # Skip the per-session log directory/CSV files (e.g. retrieval-only runs)
+    disable_file_logs: bool = False
+
+    # Threads decompressing members of one ZIP (per extraction process)
+    zip_member_threads: int = 4
+    # Skip per-member CRC32 checks when extracting (archives are already content-hashed)
+    zip_skip_crc: bool = False
+    # Threads running OCR on the pages of one scanned PDF (build_ocr_only)
+    ocr_workers: int = 4
+    # Run those OCR workers as processes (page rendering parallelised too)
+    ocr_processes: bool = False
+    # OCR render resolution; pages larger than A4 are rendered lower (same pixel budget)
+    ocr_dpi: int = 300
+
     # ─── Models / Vector DB ────────────────────────────────────────────────
     llm_model:         str  = "qwen2.5:1.5b"
     qdrant_url: str = "http://localhost:6333" # health check URL
+    # gRPC for searches/upserts (lower per-call latency); off by default for Windows setups
+    qdrant_prefer_grpc: bool = False
+    qdrant_grpc_port:   int  = 6334
 
 
     # Embeddings (Jina v3 = 1024-D)
     embed_model:       str  = "jinaai/jina-embeddings-v3"
-    embed_dim:         int  = 1024
+    embed_dim:         int  = 1024  # Matryoshka crop; keep a multiple of 8 (rounded down otherwise)
 
     # ✅ Jina v3 requires different prefixes for docs vs. queries
     embed_doc_prefix:  str  = "search_document: "
     embed_query_prefix:str  = "search_query: "
 
     qdrant_collection: str  = "tender_docs_jina-v3_d1024_fresh"
+    # New collections: int8 scalar quantization in RAM, fp32 originals on disk for rescoring
+    qdrant_int8_quantization: bool = True
 
     # ─── Embedding-time knobs ──────────────────────────────────────────────
     embed_batch_size:   int = 32
     max_seq_length:     int = 8192
     embed_flush_chunks: int = 1000
+    # torch.compile the encoder on CUDA (one-off compile cost; opt-in)
+    embed_compile:      bool = False
+    # Reuse embeddings of repeated chunk texts (state_dir/embed_cache, FP16)
+    embed_cache:        bool = True
+    # CPU-only retrieval: INT8 dynamic quantization of the query encoder (opt-in)
+    embed_query_int8:   bool = False
 
     # ─── Chunking ──────────────────────────────────────────────────────────
     chunk_size:    int = 1000
@@ -63,7 +92,8 @@ class AppConfig(BaseSettings):
     reranker_model:    str    = "BAAI/bge-reranker-v2-m3"
     rerank_keep:       int    = 24
     rerank_weight:     float  = 0.8
-    rerank_batch_size: int    = 64
+    rerank_batch_size: int    = 64   # raise (e.g. 128) on large GPUs
+    rerank_max_length: int    = 512  # query+passage tokens per pair
 
     # ─── Convenience properties (don’t override via env) ──────────────────
     @property
@@ -77,4 +107,14 @@ class AppConfig(BaseSettings):
         return self.final_k
 
 
-CFG = AppConfig()
+@lru_cache(maxsize=1)
+def get_cfg() -> AppConfig:
+    """Process-wide settings singleton; RAGBOT_* env vars are read on first call only."""
+    return AppConfig()
+
+
+def __getattr__(name: str):
+    # Back-compat: `from core.config import CFG` resolves lazily to get_cfg()
+    if name == "CFG":
+        return get_cfg()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -8,24 +8,64 @@ This module provides:
 """
 from __future__ import annotations
 
+import json
+import multiprocessing as mp
+import os
 import pickle
 import re
+import uuid
+from collections import Counter
+from functools import lru_cache
+from itertools import filterfalse
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
 
-from rank_bm25 import BM25Okapi
+import numpy as np
 
-from .config import CFG
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except Exception:
+    ORJSON_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except Exception:
+    NUMBA_AVAILABLE = False
+
+from .config import get_cfg
+
+CFG = get_cfg()
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, nogil=True)
+    def _accumulate_bm25(term_ids, t_indptr, t_docs, t_tf, idf, norm, k1, out):
+        """BM25Index._score in one pass over the query terms' postings (no temporaries)."""
+        for t in term_ids:
+            w = idf[t] * (k1 + np.float32(1.0))
+            for j in range(t_indptr[t], t_indptr[t + 1]):
+                d = t_docs[j]
+                tf = t_tf[j]
+                out[d] += w * tf / (tf + norm[d])
 
 
 # ─── German stopwords (common words to filter out) ─────────────────────────
-GERMAN_STOPWORDS = {
+GERMAN_STOPWORDS = frozenset({
     "der", "die", "das", "den", "dem", "des", "ein", "eine", "einer", "eines",
     "und", "oder", "aber", "ist", "sind", "wird", "werden", "hat", "haben",
     "für", "von", "mit", "auf", "in", "zu", "an", "bei", "durch", "über",
     "um", "nach", "aus", "vor", "zwischen", "unter", "auch", "noch", "nur",
     "sich", "nicht", "mehr", "als", "wie", "da", "so", "wenn", "dann",
-}
+})
+
+# Split on non-alphanumeric (keeps digits); compiled once for index builds.
+# Word runs are matched greedily, so `{2,}` drops exactly the 1-char tokens.
+_TOKEN_RE = re.compile(r'\w{2,}')
+
+# Below this many documents a process pool costs more than it saves
+PARALLEL_TOKENIZE_MIN_DOCS = 10_000
 
 
 # ─── Simple tokenizer ───────────────────────────────────────────────────────
@@ -37,28 +77,45 @@ def tokenize_german(text: str) -> List[str]:
     - Removes stopwords
     - Keeps alphanumeric tokens (≥2 chars)
     """
-    text = text.lower()
-    # Split on non-alphanumeric (keeps digits)
-    tokens = re.findall(r'\w+', text)
-    # Filter stopwords and very short tokens
-    return [t for t in tokens if len(t) >= 2 and t not in GERMAN_STOPWORDS]
+    # Short tokens never match the regex; stopwords are filtered at C level
+    return list(filterfalse(GERMAN_STOPWORDS.__contains__, _TOKEN_RE.findall(text.lower())))
 
 
 # ─── BM25 Index Class ───────────────────────────────────────────────────────
 class BM25Index:
     """
-    BM25 sparse retrieval index.
-    
+    BM25 sparse retrieval index (Okapi BM25, vectorized with NumPy).
+
+    Term frequencies are kept as a doc-major CSR matrix (`csr_data`,
+    `csr_indices`, `csr_indptr`). For scoring, a term-major copy of the same
+    postings is derived once so a query only touches the rows of its own terms.
+
     Attributes:
-        bm25: BM25Okapi instance
-        doc_ids: List of document IDs (Qdrant point IDs)
+        vocab: Dict mapping term -> term id (CSR column)
+        doc_ids: Array of document IDs (Qdrant point IDs), row-aligned with the CSR matrix;
+            int64 when every id is an integer, else fixed-width unicode (see `id_type`)
         doc_metadata: Dict mapping doc_id -> metadata (for debugging/filtering)
+        doc_lens: Token count per document
+        idf: IDF weight per term id
     """
-    
-    def __init__(self):
-        self.bm25: Optional[BM25Okapi] = None
-        self.doc_ids: List[str] = []
+
+    FORMAT_VERSION = 3
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.vocab: Dict[str, int] = {}
+        self.doc_ids: np.ndarray = np.empty(0, dtype=str)
+        self.id_type: str = "str"
         self.doc_metadata: Dict[str, Dict] = {}
+        self.csr_data: Optional[np.ndarray] = None
+        self.csr_indices: Optional[np.ndarray] = None
+        self.csr_indptr: Optional[np.ndarray] = None
+        self.doc_lens: Optional[np.ndarray] = None
+        self.avgdl: float = 0.0
+        self.idf: Optional[np.ndarray] = None
+        self._norm: Optional[np.ndarray] = None
+        self._postings: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
         self._is_built = False
     
     def build_index(self, documents: List[Dict]) -> None:
@@ -76,36 +133,216 @@ class BM25Index:
         
         print(f"🔨 Building BM25 index from {len(documents)} documents...")
         
-        # Tokenize all documents
-        tokenized_docs = []
-        self.doc_ids = []
-        self.doc_metadata = {}
+        doc_ids, tokenized_docs, self.doc_metadata = self._tokenize_documents(documents)
+        
+        if not tokenized_docs:
+            raise ValueError("No valid documents to index (all empty after tokenization)")
+        
+        # Build BM25 index
+        self._set_doc_ids(doc_ids)
+        self._fit_counts(
+            (Counter(tokens) for tokens in tokenized_docs),
+            [len(tokens) for tokens in tokenized_docs],
+        )
+        self._is_built = True
         
+        print(f"✅ BM25 index built with {len(self.doc_ids)} documents")
+
+    def add_documents(self, documents: List[Dict]) -> int:
+        """
+        Append documents to a built index without re-tokenizing the corpus.
+
+        New terms extend the vocab; CSR rows and term-major postings are
+        extended in place of a rebuild, then idf (O(vocab)) and length norms
+        (O(docs)) are refreshed. Ids already in the index are skipped.
+
+        Args:
+            documents: Same shape as for `build_index()`
+
+        Returns:
+            Number of documents added
+        """
+        if not self._is_built:
+            raise RuntimeError("BM25 index not built. Call build_index() first.")
+        
+        old_ids = self.doc_ids.astype(str).tolist()
+        existing = set(old_ids)
+        fresh = []
         for doc in documents:
+            if str(doc['id']) in existing:
+                print(f"⚠️  Warning: Document {doc['id']} already indexed, skipping")
+                continue
+            fresh.append(doc)
+        
+        new_ids, tokenized_docs, metadata = self._tokenize_documents(fresh)
+        if not tokenized_docs:
+            return 0
+        
+        # New CSR rows (vocab ids continue after the existing terms)
+        n_old_docs, n_old_terms = len(self.doc_lens), len(self.vocab)
+        indptr = [0]
+        indices: List[int] = []
+        data: List[int] = []
+        for tokens in tokenized_docs:
+            counts = Counter(tokens)
+            indices.extend(self.vocab.setdefault(t, len(self.vocab)) for t in counts)
+            data.extend(counts.values())
+            indptr.append(len(indices))
+        add_indices = np.asarray(indices, dtype=np.int32)
+        add_data = np.asarray(data, dtype=np.float32)
+        add_indptr = np.asarray(indptr, dtype=np.int64)
+        n_terms = len(self.vocab)
+        
+        # Merge postings: new rows have the highest doc indices, so per term
+        # they go after the existing entries and no global re-sort is needed
+        old_t_indptr, old_docs, old_tf = self._postings
+        old_df = np.zeros(n_terms, dtype=np.int64)
+        old_df[:n_old_terms] = np.diff(old_t_indptr)
+        add_df = np.bincount(add_indices, minlength=n_terms)
+        df = old_df + add_df
+        t_indptr = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(df, out=t_indptr[1:])
+        post_docs = np.empty(t_indptr[-1], dtype=np.int32)
+        post_tf = np.empty(t_indptr[-1], dtype=np.float32)
+        
+        old_terms = np.repeat(np.arange(n_old_terms), np.diff(old_t_indptr))
+        old_pos = np.arange(len(old_terms)) - old_t_indptr[old_terms] + t_indptr[old_terms]
+        post_docs[old_pos] = old_docs
+        post_tf[old_pos] = old_tf
+        
+        order = np.argsort(add_indices, kind="stable")
+        add_terms = add_indices[order]
+        add_t_indptr = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(add_df, out=add_t_indptr[1:])
+        add_pos = np.arange(len(add_terms)) - add_t_indptr[add_terms] + t_indptr[add_terms] + old_df[add_terms]
+        add_rows = np.repeat(np.arange(n_old_docs, n_old_docs + len(new_ids), dtype=np.int32), np.diff(add_indptr))
+        post_docs[add_pos] = add_rows[order]
+        post_tf[add_pos] = add_data[order]
+        self._postings = (t_indptr, post_docs, post_tf)
+        
+        self.csr_data = np.concatenate([self.csr_data, add_data])
+        self.csr_indices = np.concatenate([self.csr_indices, add_indices])
+        self.csr_indptr = np.concatenate([self.csr_indptr, add_indptr[1:] + self.csr_indptr[-1]])
+        self.doc_lens = np.concatenate([self.doc_lens, np.asarray([len(t) for t in tokenized_docs], dtype=np.float32)])
+        self._set_doc_ids(old_ids + new_ids)
+        self.doc_metadata.update(metadata)
+        self._update_idf_norm(df)
+        
+        # Cached hits may point at the old corpus
+        _cached_search.cache_clear()
+        
+        print(f"➕ Added {len(new_ids)} documents to BM25 index ({len(self.doc_ids)} total)")
+        return len(new_ids)
+
+    def _tokenize_documents(self, documents: List[Dict]) -> Tuple[List[str], List[List[str]], Dict[str, Dict]]:
+        """Tokenize documents, skipping (with a warning) those without usable text."""
+        # Order-preserving, so results stay aligned with `documents`
+        texts = [doc.get('text', '') or '' for doc in documents]
+        if len(texts) < PARALLEL_TOKENIZE_MIN_DOCS:
+            all_tokens = [tokenize_german(text) for text in texts]
+        else:
+            n_procs = os.cpu_count() or 1
+            chunksize = max(256, len(texts) // (n_procs * 4))
+            # forkserver/spawn: add_documents may run inside the app, whose logger
+            # listener/CSV/sampler threads must not be forked
+            ctx = mp.get_context("forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn")
+            with ctx.Pool(n_procs) as pool:
+                all_tokens = list(pool.imap(tokenize_german, texts, chunksize=chunksize))
+        
+        tokenized_docs = []
+        doc_ids: List[str] = []
+        doc_metadata: Dict[str, Dict] = {}
+        
+        for doc, text, tokens in zip(documents, texts, all_tokens):
             doc_id = str(doc['id'])
-            text = doc.get('text', '')
             
             if not text:
                 print(f"⚠️  Warning: Document {doc_id} has no text, skipping")
                 continue
             
-            tokens = tokenize_german(text)
             if not tokens:
                 print(f"⚠️  Warning: Document {doc_id} tokenized to empty, skipping")
                 continue
             
             tokenized_docs.append(tokens)
-            self.doc_ids.append(doc_id)
-            self.doc_metadata[doc_id] = doc.get('metadata', {})
-        
-        if not tokenized_docs:
-            raise ValueError("No valid documents to index (all empty after tokenization)")
+            doc_ids.append(doc_id)
+            doc_metadata[doc_id] = doc.get('metadata', {})
         
-        # Build BM25 index
-        self.bm25 = BM25Okapi(tokenized_docs)
-        self._is_built = True
-        
-        print(f"✅ BM25 index built with {len(self.doc_ids)} documents")
+        return doc_ids, tokenized_docs, doc_metadata
+
+    def _set_doc_ids(self, doc_ids: Sequence) -> None:
+        """Store ids as int64 if they all round-trip through int(), else as fixed-width unicode."""
+        ids = [str(d) for d in doc_ids]
+        try:
+            as_int = [int(d) for d in ids]
+            numeric = all(str(i) == d for i, d in zip(as_int, ids))
+        except ValueError:
+            numeric = False
+        if numeric:
+            self.doc_ids = np.asarray(as_int, dtype=np.int64)
+            self.id_type = "int"
+        else:
+            self.doc_ids = np.asarray(ids, dtype=str)
+            self.id_type = "str"
+
+    def _fit_counts(self, doc_counts: Iterable[Mapping[str, int]], doc_lens: Sequence[int]) -> None:
+        """Build vocab + CSR term-frequency matrix from per-document term counts."""
+        vocab: Dict[str, int] = {}
+        indptr = [0]
+        indices: List[int] = []
+        data: List[int] = []
+        for counts in doc_counts:
+            indices.extend(vocab.setdefault(t, len(vocab)) for t in counts)
+            data.extend(counts.values())
+            indptr.append(len(indices))
+
+        self.vocab = vocab
+        self.csr_data = np.asarray(data, dtype=np.float32)
+        self.csr_indices = np.asarray(indices, dtype=np.int32)
+        self.csr_indptr = np.asarray(indptr, dtype=np.int64)
+        self.doc_lens = np.asarray(doc_lens, dtype=np.float32)
+        self._update_stats()
+
+    def _update_stats(self) -> None:
+        """Recompute IDF, length normalization and the term-major postings."""
+        n_docs = len(self.doc_lens)
+        n_terms = len(self.vocab)
+
+        # Term-major view of the CSR matrix: postings[t] = (doc indices, tf)
+        order = np.argsort(self.csr_indices, kind="stable")
+        entry_doc = np.repeat(np.arange(n_docs, dtype=np.int32), np.diff(self.csr_indptr))
+        df = np.bincount(self.csr_indices, minlength=n_terms)
+        t_indptr = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(df, out=t_indptr[1:])
+        self._postings = (t_indptr, entry_doc[order], self.csr_data[order])
+        self._update_idf_norm(df)
+
+    def _update_idf_norm(self, df: np.ndarray) -> None:
+        """Recompute avgdl, IDF (from document frequencies) and length norms."""
+        n_docs = len(self.doc_lens)
+        self.avgdl = float(self.doc_lens.mean()) if n_docs else 0.0
+        self.idf = np.log1p((n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+        self._update_norm()
+
+    def _update_norm(self) -> None:
+        """Per-document length normalization k1 * (1 - b + b * dl / avgdl)."""
+        self._norm = (self.k1 * (1.0 - self.b + self.b * self.doc_lens / max(self.avgdl, 1e-9))).astype(np.float32)
+
+    def _score(self, term_ids: Sequence[int]) -> np.ndarray:
+        """BM25 score of every document for the given query term ids."""
+        t_indptr, t_docs, t_tf = self._postings
+        scores = np.zeros(len(self.doc_ids), dtype=np.float32)
+        if NUMBA_AVAILABLE:
+            _accumulate_bm25(
+                np.asarray(term_ids, dtype=np.int64), t_indptr, t_docs, t_tf,
+                self.idf, self._norm, np.float32(self.k1), scores,
+            )
+            return scores
+        for t in term_ids:
+            lo, hi = t_indptr[t], t_indptr[t + 1]
+            docs, tf = t_docs[lo:hi], t_tf[lo:hi]
+            scores[docs] += self.idf[t] * tf * (self.k1 + 1.0) / (tf + self._norm[docs])
+        return scores
     
     def search(self, query: str, top_k: int = 100) -> List[Tuple[str, float]]:
         """
@@ -118,55 +355,172 @@ class BM25Index:
         Returns:
             List of (doc_id, score) tuples, sorted by score descending
         """
-        if not self._is_built or self.bm25 is None:
+        ids, scores = self._search_arrays(query, top_k=top_k)
+        return list(zip(ids.tolist(), scores.tolist()))
+
+    def _search_arrays(self, query: str, top_k: int = 100) -> Tuple[np.ndarray, np.ndarray]:
+        """Like `search()`, but returns parallel (doc_ids, scores) arrays."""
+        if not self._is_built:
             raise RuntimeError("BM25 index not built. Call build_index() first.")
         
-        # Tokenize query
-        query_tokens = tokenize_german(query)
+        # Tokenize query; unknown terms contribute nothing, so drop them up front
+        vocab = self.vocab
+        term_ids = [vocab[t] for t in tokenize_german(query) if t in vocab]
         
-        if not query_tokens:
-            # Empty query after tokenization
-            return []
+        if not term_ids:
+            # Empty query after tokenization, or no term is in the index
+            return self.doc_ids[:0].astype(str), np.empty(0, dtype=np.float32)
         
         # Get BM25 scores
-        scores = self.bm25.get_scores(query_tokens)
-        
-        # Sort by score and return top_k
-        scored_docs = [(self.doc_ids[i], float(scores[i])) 
-                      for i in range(len(scores))]
-        scored_docs.sort(key=lambda x: x[1], reverse=True)
+        scores = self._score(term_ids)
         
-        return scored_docs[:top_k]
+        # Select top_k without sorting the whole corpus, then order that slice
+        if top_k >= len(scores):
+            idx = np.argsort(-scores, kind="stable")
+        else:
+            part = np.argpartition(-scores, top_k)[:top_k]
+            idx = part[np.lexsort((part, -scores[part]))]
+        # Callers (Qdrant retrieve, RRF) key on string ids regardless of storage
+        return self.doc_ids[idx].astype(str), scores[idx]
+
+    def _manifest(self) -> Dict:
+        return {
+            'version': self.FORMAT_VERSION,
+            'k1': self.k1,
+            'b': self.b,
+            'avgdl': self.avgdl,
+            'vocab': self.vocab,
+            'doc_metadata': self.doc_metadata,
+        }
+
+    def _arrays(self) -> Dict[str, np.ndarray]:
+        t_indptr, t_docs, t_tf = self._postings
+        return {
+            'doc_ids': self.doc_ids,
+            'csr_data': self.csr_data,
+            'csr_indices': self.csr_indices,
+            'csr_indptr': self.csr_indptr,
+            'doc_lens': self.doc_lens,
+            'idf': self.idf,
+            'post_indptr': t_indptr,
+            'post_docs': t_docs,
+            'post_tf': t_tf,
+        }
     
-    def save(self, filepath: Path) -> None:
-        """Save BM25 index to disk."""
+    def save(self, dirpath: Path) -> None:
+        """
+        Save BM25 index to disk.
+
+        Layout: one `<name>.<generation>.npy` file per array (including doc_ids)
+        plus `manifest.json` (params, vocab, metadata, generation) inside
+        `dirpath`. A `*.pkl` path is mapped to the sibling directory of the same stem.
+
+        Arrays of a save never overwrite those of an earlier one (processes may
+        have them memory-mapped); the manifest is swapped in atomically last, so
+        a crash mid-save leaves the previous index intact.
+        """
         if not self._is_built:
             raise RuntimeError("Cannot save: index not built")
         
-        data = {
-            'bm25': self.bm25,
-            'doc_ids': self.doc_ids,
-            'doc_metadata': self.doc_metadata,
-        }
+        if dirpath.suffix == '.pkl':
+            dirpath = dirpath.parent / dirpath.stem
+        dirpath.mkdir(parents=True, exist_ok=True)
+        generation = uuid.uuid4().hex[:12]
+        for name, arr in self._arrays().items():
+            np.save(dirpath / f"{name}.{generation}.npy", np.ascontiguousarray(arr), allow_pickle=False)
+        
+        manifest = self._manifest()
+        manifest['generation'] = generation
+        tmp = dirpath / "manifest.json.tmp"
+        if ORJSON_AVAILABLE:
+            tmp.write_bytes(orjson.dumps(manifest, default=str))
+        else:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, default=str)
+        os.replace(tmp, dirpath / "manifest.json")
         
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        with open(filepath, 'wb') as f:
-            pickle.dump(data, f)
+        # Old generations: unlinking keeps mapped data valid on POSIX; on
+        # Windows a mapped file can't be removed and is retried on the next save
+        for old in dirpath.glob("*.npy"):
+            if not old.name.endswith(f".{generation}.npy"):
+                try:
+                    old.unlink()
+                except OSError:
+                    pass
         
-        print(f"💾 BM25 index saved to {filepath}")
+        print(f"💾 BM25 index saved to {dirpath}")
     
     @classmethod
     def load(cls, filepath: Path) -> 'BM25Index':
-        """Load BM25 index from disk."""
+        """
+        Load BM25 index from disk.
+
+        A directory written by `save()` is memory-mapped (arrays are paged in
+        on demand and shared between processes). A `*.pkl` file is read as a
+        legacy pickle (format 2 or rank_bm25) for migration.
+        """
+        if filepath.suffix == '.pkl':
+            return cls._load_pickle(filepath)
+        
+        manifest_path = filepath / "manifest.json"
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"BM25 index not found at {filepath}")
+        
+        if ORJSON_AVAILABLE:
+            manifest = orjson.loads(manifest_path.read_bytes())
+        else:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        
+        # Format-3 directories written before generations have plain `<name>.npy`
+        suffix = f".{manifest['generation']}" if manifest.get('generation') else ""
+        arrays = {
+            name: np.load(filepath / f"{name}{suffix}.npy", mmap_mode='r')
+            for name in ('doc_ids', 'csr_data', 'csr_indices', 'csr_indptr', 'doc_lens',
+                         'idf', 'post_indptr', 'post_docs', 'post_tf')
+        }
+        
+        index = cls(k1=manifest['k1'], b=manifest['b'])
+        index.vocab = manifest['vocab']
+        index.doc_ids = arrays['doc_ids']
+        index.id_type = "int" if index.doc_ids.dtype.kind == 'i' else "str"
+        index.doc_metadata = manifest['doc_metadata']
+        index.csr_data = arrays['csr_data']
+        index.csr_indices = arrays['csr_indices']
+        index.csr_indptr = arrays['csr_indptr']
+        index.doc_lens = arrays['doc_lens']
+        index.idf = arrays['idf']
+        index._postings = (arrays['post_indptr'], arrays['post_docs'], arrays['post_tf'])
+        index.avgdl = manifest['avgdl']
+        index._update_norm()
+        index._is_built = True
+        
+        print(f"📂 BM25 index loaded from {filepath} ({len(index.doc_ids)} docs)")
+        return index
+
+    @classmethod
+    def _load_pickle(cls, filepath: Path) -> 'BM25Index':
+        """Load a pickled index (format 2 or a legacy rank_bm25 pickle)."""
         if not filepath.exists():
             raise FileNotFoundError(f"BM25 index not found at {filepath}")
         
         with open(filepath, 'rb') as f:
             data = pickle.load(f)
         
-        index = cls()
-        index.bm25 = data['bm25']
-        index.doc_ids = data['doc_ids']
+        if 'bm25' in data:
+            # v1: pickled rank_bm25.BM25Okapi (needs rank_bm25 installed to unpickle)
+            bm25 = data['bm25']
+            index = cls(k1=bm25.k1, b=bm25.b)
+            index._fit_counts(bm25.doc_freqs, bm25.doc_len)
+        else:
+            index = cls(k1=data['k1'], b=data['b'])
+            index.vocab = data['vocab']
+            index.csr_data = data['csr_data']
+            index.csr_indices = data['csr_indices']
+            index.csr_indptr = data['csr_indptr']
+            index.doc_lens = data['doc_lens']
+            index._update_stats()
+        index._set_doc_ids(data['doc_ids'])
         index.doc_metadata = data['doc_metadata']
         index._is_built = True
         
@@ -191,15 +545,18 @@ def get_bm25_index() -> BM25Index:
     global _bm25_index
     
     if _bm25_index is None:
-        index_path = CFG.state_dir / "bm25_index.pkl"
+        index_path = CFG.state_dir / "bm25_index"
+        legacy_path = CFG.state_dir / "bm25_index.pkl"
         
-        if not index_path.exists():
+        if (index_path / "manifest.json").exists():
+            _bm25_index = BM25Index.load(index_path)
+        elif legacy_path.exists():
+            _bm25_index = BM25Index.load(legacy_path)
+        else:
             raise RuntimeError(
                 f"BM25 index not found at {index_path}. "
                 "Run 'python scripts/build_bm25_index.py' to create it."
             )
-        
-        _bm25_index = BM25Index.load(index_path)
     
     return _bm25_index
 
@@ -208,19 +565,21 @@ def reload_bm25_index() -> None:
     """Force reload of BM25 index (useful after rebuilding)."""
     global _bm25_index
     _bm25_index = None
+    _cached_search.cache_clear()
     get_bm25_index()
 
 
 # ─── Reciprocal Rank Fusion ─────────────────────────────────────────────────
 def reciprocal_rank_fusion(
-    result_sets: List[List[Tuple[str, float]]],
+    result_sets: Sequence[Union[List[Tuple[str, float]], Tuple[np.ndarray, np.ndarray]]],
     k: int = 60
 ) -> List[Tuple[str, float]]:
     """
     Reciprocal Rank Fusion (RRF) to combine multiple ranked lists.
     
     Args:
-        result_sets: List of ranked lists, each containing (doc_id, score) tuples
+        result_sets: Ranked lists, each either a list of (doc_id, score) tuples
+            or a (doc_ids, scores) array pair as returned by `_search_arrays()`
         k: RRF constant (default: 60, standard value from literature)
     
     Returns:
@@ -230,18 +589,37 @@ def reciprocal_rank_fusion(
         Cormack et al. "Reciprocal Rank Fusion outperforms Condorcet and 
         individual Rank Learning Methods" (SIGIR 2009)
     """
-    fused_scores: Dict[str, float] = {}
+    # Map doc_ids to contiguous ints (first-seen order) and collect contributions
+    id_map: Dict[str, int] = {}
+    id_parts: List[np.ndarray] = []
+    contrib_parts: List[np.ndarray] = []
     
     for results in result_sets:
-        for rank, (doc_id, _) in enumerate(results, start=1):
-            # RRF formula: score = 1 / (k + rank)
-            fused_scores[doc_id] = fused_scores.get(doc_id, 0.0) + (1.0 / (k + rank))
+        if isinstance(results, tuple) and len(results) == 2 and isinstance(results[0], np.ndarray):
+            ranked_ids = results[0].tolist()
+        else:
+            ranked_ids = [doc_id for doc_id, _ in results]
+        if not ranked_ids:
+            continue
+        ids_int = np.fromiter(
+            (id_map.setdefault(doc_id, len(id_map)) for doc_id in ranked_ids),
+            dtype=np.int64,
+            count=len(ranked_ids),
+        )
+        # RRF formula: score = 1 / (k + rank)
+        id_parts.append(ids_int)
+        contrib_parts.append(1.0 / (k + np.arange(1, len(ids_int) + 1, dtype=np.float64)))
     
-    # Sort by fused score descending
-    fused_results = [(doc_id, score) for doc_id, score in fused_scores.items()]
-    fused_results.sort(key=lambda x: x[1], reverse=True)
+    if not id_map:
+        return []
     
-    return fused_results
+    fused = np.zeros(len(id_map), dtype=np.float64)
+    np.add.at(fused, np.concatenate(id_parts), np.concatenate(contrib_parts))
+    
+    # Sort by fused score descending (ties keep first-seen order)
+    doc_ids = np.asarray(list(id_map), dtype=object)
+    order = np.argsort(-fused, kind="stable")
+    return list(zip(doc_ids[order].tolist(), fused[order].tolist()))
 
 
 # ─── Hybrid Search Function ─────────────────────────────────────────────────
@@ -256,6 +634,11 @@ def search_bm25(query: str, top_k: int = 100) -> List[Tuple[str, float]]:
     Returns:
         List of (doc_id, bm25_score) tuples
     """
-    index = get_bm25_index()
-    return index.search(query, top_k=top_k)
+    return list(_cached_search(query, top_k))
+
+
+@lru_cache(maxsize=1024)
+def _cached_search(query: str, top_k: int) -> Tuple[Tuple[str, float], ...]:
+    # Immutable so callers can't alter cached hits; cleared by reload_bm25_index()
+    return tuple(get_bm25_index().search(query, top_k=top_k))
 
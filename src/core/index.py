@@ -1,8 +1,13 @@
 # core/index.py
 from __future__ import annotations
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Deque, Iterable, List, Dict, Optional, Tuple
 import hashlib
+import multiprocessing as mp
+import os
 import numpy as np
 import torch
 from uuid import uuid5, NAMESPACE_URL
@@ -11,62 +16,212 @@ from qdrant_client import QdrantClient
 from qdrant_client.http import models as qmodels
 from sentence_transformers import SentenceTransformer
 
-from .domain import DocumentPage, DocumentChunk
-from .io import PDFLoader, ExcelMetadataJoiner
-from .config import CFG
+from .io import (  # chunker + pool worker live in core.io (light import for workers)
+    PDFLoader, ExcelMetadataJoiner, FileHashCache, PageAwareChunker, _hash_file, _load_and_chunk, iter_files,
+)
+from .config import get_cfg
+
+CFG = get_cfg()
 
 # Pin to an exact revision so remote code doesn't change between runs
 PINNED_SHA = "f1944de8402dcd5f2b03f822a4bc22a7f2de2eb9"  # jinaai/jina-embeddings-v3
 
 
-class PageAwareChunker:
-    def __init__(self, size: int, overlap: int):
-        self.size, self.overlap = size, overlap
-
-    def split(self, pages: List[DocumentPage]) -> List[DocumentChunk]:
-        text_acc: List[str] = []
-        page_acc: List[int] = []
-        chunks: List[DocumentChunk] = []
-        idx = 0
-
-        def flush():
-            nonlocal idx, text_acc, page_acc
-            if not text_acc:
-                return
-            text = "".join(text_acc)
-            page_start, page_end = (page_acc[0], page_acc[-1]) if page_acc else (None, None)
-            chunks.append(
-                DocumentChunk(
-                    chunk_index=idx,
-                    text=text,
-                    source_path=pages[0].source_path if pages else None,
-                    page_start=page_start,
-                    page_end=page_end,
-                    meta={},
-                )
-            )
-            idx += 1
-            keep = text[-self.overlap:] if self.overlap > 0 else ""
-            text_acc = [keep] if keep else []
-            page_acc = [page_end] if (self.overlap > 0 and page_end is not None) else []
-
-        for p in pages:
-            t = p.text or ""
-            if not t:
-                continue
-            cursor = 0
-            while cursor < len(t):
-                space_left = self.size - sum(len(x) for x in text_acc)
-                if space_left <= 0:
-                    flush()
-                    space_left = self.size
-                take = t[cursor : cursor + space_left]
-                text_acc.append(take)
-                if p.page_number not in page_acc:
-                    page_acc.append(p.page_number)
-                cursor += len(take)
-        flush()
-        return chunks
+def _int_point_id(doc_hash: str, chunk_idx: int) -> int:
+    """Deterministic 63-bit point id (Qdrant unsigned-int ids; also fits int64 for BM25)."""
+    digest = hashlib.blake2b(f"{doc_hash}|{chunk_idx}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") & ((1 << 63) - 1)
+
+
+def _int8_quantization() -> qmodels.ScalarQuantization:
+    """int8 scalar quantization kept in RAM (originals serve rescoring)."""
+    return qmodels.ScalarQuantization(
+        scalar=qmodels.ScalarQuantizationConfig(
+            type=qmodels.ScalarType.INT8,
+            quantile=0.99,
+            always_ram=True,
+        )
+    )
+
+
+def tune_collection(cfg=None, ef_construct: int = 200) -> None:
+    """
+    One-off admin step for an existing collection: denser HNSW graph
+    (m=16, ef_construct) plus int8 scalar quantization, so collections built
+    before these defaults get the same query path. Qdrant rebuilds the index
+    in the background.
+    """
+    cfg = cfg or get_cfg()
+    client = QdrantClient(url=cfg.qdrant_url, prefer_grpc=cfg.qdrant_prefer_grpc, grpc_port=cfg.qdrant_grpc_port)
+    client.update_collection(
+        collection_name=cfg.qdrant_collection,
+        hnsw_config=qmodels.HnswConfigDiff(m=16, ef_construct=ef_construct),
+        quantization_config=_int8_quantization(),
+    )
+    print(f"✅ Tuned collection: {cfg.qdrant_collection} (m=16, ef_construct={ef_construct}, int8)")
+
+
+class _PointBuffer:
+    """
+    Columnar upsert buffer: point ids and payloads as lists, embeddings as
+    whole (n, dim) blocks. A flush sends one qmodels.Batch, converting all
+    vectors with a single ndarray -> list call instead of one per point.
+
+    Flushes are pipelined: the upsert runs on a background thread so the
+    caller can embed the next batch meanwhile. At most `max_inflight`
+    upserts are outstanding; drain() waits for all of them.
+
+    An upsert error surfaces later than the PDF being processed, so each
+    batch remembers the source PDFs it holds; failed batches are collected
+    as (sources, n_points, error) for pop_failures().
+    """
+
+    def __init__(self, max_inflight: int = 4):
+        self.ids: List[int | str] = []
+        self.payloads: List[Dict] = []
+        self.blocks: List[np.ndarray] = []
+        self.sources: List[Path] = []
+        self.max_inflight = max(1, int(max_inflight))
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._inflight: Deque[Tuple[Future, List[Path], int]] = deque()
+        self._failures: List[Tuple[List[Path], int, Exception]] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, ids: List[int | str], vectors: np.ndarray, payloads: List[Dict], sources: Iterable[Path] = ()) -> None:
+        self.ids.extend(ids)
+        self.payloads.extend(payloads)
+        self.blocks.append(vectors)
+        self.sources.extend(s for s in sources if s not in self.sources)
+
+    @staticmethod
+    def _upsert(client: QdrantClient, collection: str, ids: List[int | str], blocks: List[np.ndarray], payloads: List[Dict]) -> None:
+        client.upsert(
+            collection_name=collection,
+            points=qmodels.Batch(ids=ids, vectors=np.vstack(blocks).tolist(), payloads=payloads),
+            wait=False,
+        )
+
+    def _reap(self) -> None:
+        """Wait for the oldest queued upsert; record its sources if it failed."""
+        fut, sources, n = self._inflight.popleft()
+        try:
+            fut.result()
+        except Exception as e:
+            self._failures.append((sources, n, e))
+
+    def flush(self, client: QdrantClient, collection: str) -> int:
+        """Queue an upsert of everything buffered and reset; returns #points sent."""
+        n = len(self.ids)
+        if n:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_inflight, thread_name_prefix="qdrant-upsert")
+            while len(self._inflight) >= self.max_inflight:
+                self._reap()
+            self._inflight.append((
+                self._pool.submit(self._upsert, client, collection, self.ids, self.blocks, self.payloads),
+                self.sources,
+                n,
+            ))
+            self.ids, self.payloads, self.blocks, self.sources = [], [], [], []
+        return n
+
+    def drain(self) -> None:
+        """Block until every queued upsert has been acknowledged (or failed)."""
+        try:
+            while self._inflight:
+                self._reap()
+        finally:
+            self._inflight.clear()
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+    def pop_failures(self) -> List[Tuple[List[Path], int, Exception]]:
+        """Failed upserts since the last call, as (source PDFs, #points, error)."""
+        failures, self._failures = self._failures, []
+        return failures
+
+
+class _EmbeddingCache:
+    """
+    Content-addressed embedding cache: blake2b-64(chunk text) -> FP16 vector.
+    Boilerplate (standard clauses, headers) recurs across tenders and reruns,
+    so repeats skip the embedder. Persisted as keys.npy + vectors.npy
+    (vectors memory-mapped on load) in a directory per model/revision/prefix/dim,
+    so a config change never serves stale vectors.
+    """
+
+    def __init__(self, dirpath: Path, dim: int):
+        self.dir = Path(dirpath)
+        self.dim = int(dim)
+        self._rows: Dict[int, int] = {}
+        self._base: np.ndarray = np.zeros((0, self.dim), dtype=np.float16)
+        self._extra = np.empty((1024, self.dim), dtype=np.float16)
+        self._extra_n = 0
+        keys_p, vecs_p = self.dir / "keys.npy", self.dir / "vectors.npy"
+        if keys_p.exists() and vecs_p.exists():
+            try:
+                keys = np.load(keys_p)
+                vecs = np.load(vecs_p, mmap_mode="r")
+                if vecs.ndim == 2 and vecs.shape[1] == self.dim and len(keys) == len(vecs):
+                    self._base = vecs
+                    self._rows = dict(zip(keys.tolist(), range(len(keys))))
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Ignoring unreadable embedding cache {self.dir}: {e}")
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @staticmethod
+    def key(text: str) -> int:
+        digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+        return int.from_bytes(digest, "little") & ((1 << 63) - 1)
+
+    def lookup(self, keys: List[int]) -> np.ndarray:
+        """Row per key, -1 on a miss."""
+        get = self._rows.get
+        return np.fromiter((get(k, -1) for k in keys), dtype=np.int64, count=len(keys))
+
+    def gather(self, rows: np.ndarray) -> np.ndarray:
+        out = np.empty((len(rows), self.dim), dtype=np.float32)
+        in_base = rows < len(self._base)
+        if in_base.any():
+            out[in_base] = self._base[rows[in_base]]
+        if not in_base.all():
+            out[~in_base] = self._extra[rows[~in_base] - len(self._base)]
+        return out
+
+    def put(self, keys: List[int], vectors: np.ndarray) -> None:
+        n = len(keys)
+        need = self._extra_n + n
+        if need > len(self._extra):
+            grown = np.empty((max(need, 2 * len(self._extra)), self.dim), dtype=np.float16)
+            grown[: self._extra_n] = self._extra[: self._extra_n]
+            self._extra = grown
+        self._extra[self._extra_n : need] = vectors
+        start = len(self._base) + self._extra_n
+        for i, k in enumerate(keys):
+            self._rows[k] = start + i
+        self._extra_n = need
+
+    def save(self) -> None:
+        if not self._extra_n:
+            return
+        vecs = np.concatenate([np.asarray(self._base), self._extra[: self._extra_n]])
+        keys = np.empty(len(vecs), dtype=np.int64)
+        keys[np.fromiter(self._rows.values(), dtype=np.int64, count=len(self._rows))] = np.fromiter(
+            self._rows.keys(), dtype=np.int64, count=len(self._rows)
+        )
+        # Drop the mmap before replacing its file (Windows can't replace mapped files)
+        self._base, self._extra_n = vecs, 0
+        self.dir.mkdir(parents=True, exist_ok=True)
+        for name, arr in (("vectors.npy", vecs), ("keys.npy", keys)):
+            tmp = self.dir / f"{name}.tmp"
+            with open(tmp, "wb") as fh:
+                np.save(fh, arr)
+            os.replace(tmp, self.dir / name)
 
 
 class Indexer:
@@ -101,24 +256,51 @@ class Indexer:
             trust_remote_code=True,
             device=self.device,
         )
+        if self.device == "cuda":
+            self.embedder.half()  # pure FP16 inference; no per-op autocast casts
+        self.embedder.max_seq_length = min(int(cfg.max_seq_length), int(self.embedder.max_seq_length or cfg.max_seq_length))
+        if self.device == "cuda" and getattr(cfg, "embed_compile", False):
+            self._compile_embedder()
         self.raw_dim = self._get_embed_dim(self.embedder)
         # Effective dim = min(configured, raw). Keeps compatibility if model grows.
         self.effective_dim = min(int(getattr(cfg, "embed_dim", self.raw_dim)), self.raw_dim)
+        if self.effective_dim % 8 and self.effective_dim > 8:
+            # Matryoshka crop: round down so FP16/INT8 GEMMs on these vectors stay tensor-core aligned
+            aligned = self.effective_dim - self.effective_dim % 8
+            print(f"⚠️  embed_dim {self.effective_dim} is not a multiple of 8; using {aligned}")
+            self.effective_dim = aligned
 
         # ---- qdrant client ----
-        self.client = QdrantClient(url=cfg.qdrant_url, prefer_grpc=False)
+        self.client = QdrantClient(
+            url=cfg.qdrant_url,
+            prefer_grpc=cfg.qdrant_prefer_grpc,
+            grpc_port=cfg.qdrant_grpc_port,
+        )
 
         # ---- collection bootstrap/validate ----
         self._ensure_collection(self.effective_dim)
+        # Collections built before integer ids keep UUIDs so appends stay idempotent
+        self.uuid_ids = (not self.fresh) and self._collection_uses_uuid_ids()
 
         # ---- helpers ----
         self.loader = PDFLoader()  # swap to OCR mode in build_ocr_only()
         self.chunker = PageAwareChunker(cfg.chunk_size, cfg.chunk_overlap)
         self.joiner = ExcelMetadataJoiner()
+        self.hash_cache = FileHashCache("sha1")  # sha1 keeps point ids stable
 
         # ---- Jina prompt prefix ----
         self.doc_prefix = getattr(cfg, "embed_doc_prefix", "search_document: ")
 
+        # ---- embedding cache (keyed by chunk text; scoped to model/prefix/dim) ----
+        self.vec_cache: Optional[_EmbeddingCache] = None
+        if getattr(cfg, "embed_cache", True):
+            scope = hashlib.sha1(
+                f"{cfg.embed_model}|{PINNED_SHA}|{self.doc_prefix}|{self.effective_dim}".encode("utf-8")
+            ).hexdigest()[:12]
+            self.vec_cache = _EmbeddingCache(Path(cfg.state_dir) / "embed_cache" / scope, self.effective_dim)
+            if len(self.vec_cache):
+                print(f"🗃️  Embedding cache: {len(self.vec_cache)} vectors")
+
     # ---------------- helpers ----------------
 
     def _get_embed_dim(self, model: SentenceTransformer) -> int:
@@ -128,6 +310,25 @@ class Indexer:
             v = model.encode("probe", normalize_embeddings=True)
             return int(len(v))
 
+    def _compile_embedder(self) -> None:
+        """torch.compile the HF encoder in place; falls back to eager on any failure."""
+        enc = self.embedder[0].auto_model
+        eager_forward = enc.forward
+        try:
+            # dynamic=True: chunk lengths vary, avoid one recompile per padded shape
+            enc.forward = torch.compile(eager_forward, dynamic=True, fullgraph=False)
+            print("⚙️  Compiling embedder (first batch is slow)...")
+            with torch.inference_mode():
+                self.embedder.encode(
+                    ["warmup " * 64] * int(self.cfg.embed_batch_size),
+                    batch_size=self.cfg.embed_batch_size,
+                    convert_to_numpy=True,
+                )
+            print("✅ Embedder compiled")
+        except Exception as e:
+            enc.forward = eager_forward
+            print(f"⚠️  torch.compile failed, using eager embedder: {e}")
+
     def _existing_collection_dim(self) -> Optional[int]:
         try:
             info = self.client.get_collection(self.cfg.qdrant_collection)
@@ -142,14 +343,17 @@ class Indexer:
         return None
 
     def _create_collection(self, dim: int) -> None:
+        quantize = bool(getattr(self.cfg, "qdrant_int8_quantization", False))
         self.client.create_collection(
             collection_name=self.cfg.qdrant_collection,
-            vectors_config=qmodels.VectorParams(size=dim, distance=qmodels.Distance.COSINE),
+            # With int8 quantization the fp32 originals only serve rescoring, so they live on disk
+            vectors_config=qmodels.VectorParams(size=dim, distance=qmodels.Distance.COSINE, on_disk=quantize),
             hnsw_config=qmodels.HnswConfigDiff(m=16, ef_construct=64),
             optimizers_config=qmodels.OptimizersConfigDiff(indexing_threshold=20_000),
+            quantization_config=_int8_quantization() if quantize else None,
             on_disk_payload=False,
         )
-        print(f"✅ Created collection: {self.cfg.qdrant_collection} (dim={dim})")
+        print(f"✅ Created collection: {self.cfg.qdrant_collection} (dim={dim}{', int8-quantized' if quantize else ''})")
 
     def _ensure_collection(self, dim: int) -> None:
         existing_dim = self._existing_collection_dim()
@@ -182,160 +386,224 @@ class Indexer:
             )
 
     def _embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts, serving repeats from the embedding cache and encoding only unseen ones."""
+        if self.vec_cache is None or not texts:
+            return self._encode(texts)
+
+        keys = [self.vec_cache.key(t) for t in texts]
+        rows = self.vec_cache.lookup(keys)
+        miss_pos: Dict[int, int] = {}  # key -> first position; repeats within a call encode once
+        for i in np.flatnonzero(rows < 0).tolist():
+            miss_pos.setdefault(keys[i], i)
+        if miss_pos:
+            vecs = self._encode([texts[i] for i in miss_pos.values()])
+            self.vec_cache.put(list(miss_pos), vecs)
+            rows = self.vec_cache.lookup(keys)
+        return self.vec_cache.gather(rows)
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
         """
         Embed texts with:
-          - Jina document prefix (from CFG)
-          - autocast on CUDA
+          - Jina document prefix (from CFG), applied by encode(prompt=...)
+          - longest-first length ordering, so each encode batch pads tightly
+          - FP16 weights on CUDA (cast once in __init__, no autocast)
           - Matryoshka crop to self.effective_dim
         """
         if not texts:
             return np.zeros((0, self.effective_dim), dtype="float32")
 
-        prefixed = [self.doc_prefix + (t or "") for t in texts]
-
-        if self.device == "cuda":
-            torch.cuda.empty_cache()
-            with torch.inference_mode(), torch.cuda.amp.autocast():
-                out = self.embedder.encode(
-                    prefixed,
-                    batch_size=self.cfg.embed_batch_size,
-                    normalize_embeddings=True,
-                    convert_to_numpy=True,
-                    show_progress_bar=True,
-                )
-        else:
-            with torch.inference_mode():
-                out = self.embedder.encode(
-                    prefixed,
-                    batch_size=self.cfg.embed_batch_size,
-                    normalize_embeddings=True,
-                    convert_to_numpy=True,
-                    show_progress_bar=True,
-                )
-
-        out = np.asarray(out, dtype="float32")
-        if out.shape[1] > self.effective_dim:
-            orig = out.shape[1]
-            out = out[:, : self.effective_dim]
-            print(f"📐 Cropped embeddings {orig} → {self.effective_dim} dims")
+        # Bucket by length ourselves rather than relying on the encoder's
+        # internal sort; rows are scattered back to input order below
+        order = np.argsort([-len(t) for t in texts], kind="stable")
+        texts = [texts[i] for i in order]
+
+        with torch.inference_mode():
+            # Stay on device: crop + un-sort there, then one device->host copy
+            enc = self.embedder.encode(
+                texts,
+                prompt=self.doc_prefix,
+                batch_size=self.cfg.embed_batch_size,
+                normalize_embeddings=True,
+                convert_to_tensor=True,
+                show_progress_bar=True,
+            )
+            if enc.shape[1] > self.effective_dim:
+                orig = enc.shape[1]
+                enc = enc[:, : self.effective_dim]
+                print(f"📐 Cropped embeddings {orig} → {self.effective_dim} dims")
+            inverse = torch.from_numpy(np.argsort(order)).to(enc.device)
+            out = enc.index_select(0, inverse).float().cpu().numpy()
 
-        if self.device == "cuda":
-            torch.cuda.empty_cache()
         return out
 
-    def _point_id(self, doc_hash: str, chunk_idx: int) -> str:
-        """Deterministic UUID for points (idempotent upserts)."""
-        return str(uuid5(NAMESPACE_URL, f"{doc_hash}|{chunk_idx}"))
+    def _collection_uses_uuid_ids(self) -> bool:
+        try:
+            points, _ = self.client.scroll(
+                self.cfg.qdrant_collection, limit=1, with_payload=False, with_vectors=False
+            )
+        except Exception:
+            return False
+        return bool(points) and isinstance(points[0].id, str)
+
+    def _point_id(self, doc_hash: str, chunk_idx: int) -> int | str:
+        """Deterministic point id (idempotent upserts): 63-bit int, or UUID for legacy collections."""
+        if self.uuid_ids:
+            return str(uuid5(NAMESPACE_URL, f"{doc_hash}|{chunk_idx}"))
+        return _int_point_id(doc_hash, chunk_idx)
 
     def _hash_file(self, pdf_path: Path) -> str:
-        """Robust file hash (fallback to path string if read fails)."""
         try:
-            return hashlib.sha1(pdf_path.read_bytes()).hexdigest()
+            return self.hash_cache.digest(pdf_path)
         except Exception:
-            return hashlib.sha1(str(pdf_path).encode("utf-8")).hexdigest()
+            return _hash_file(pdf_path)
 
     # --------------- main flows ----------------
 
-    def build(self, extract_dir: Path | None = None):
+    def build(self, extract_dir: Path | None = None, workers: Optional[int] = None):
         """
         Build (fresh or append) the index with batch upserts.
         - In fresh mode, the collection was recreated in __init__
         - In append mode, point IDs are stable and will overwrite duplicates
+        - PDF parsing/OCR, chunking and hashing run in `workers` processes
+          (default: CPU count - 1; 1 = in-process); this process only embeds
+          and upserts, so the GPU isn't idle while the next PDF is parsed
         """
         base = Path(extract_dir or self.cfg.extract_dir)
-        pdfs = sorted(base.rglob("*.pdf"))
+        pdfs = sorted(iter_files(base, ".pdf"))
         print(f"📄 Found {len(pdfs)} PDFs to process in {base}")
         if not pdfs:
             print("⚠️  No PDF files found in extract directory")
             return
 
         BUFFER_SIZE = int(self.cfg.embed_flush_chunks)
-        points_buffer: List[qmodels.PointStruct] = []
+        # Chunks from many PDFs are pooled so encode() sees large batches
+        # even when individual PDFs only yield a handful of chunks
+        EMBED_FLUSH = max(1, int(self.cfg.embed_batch_size) * 8)
+        points_buffer = _PointBuffer()
+        pending_texts: List[str] = []
+        pending_payloads: List[Dict] = []
+        pending_pdfs: List[Path] = []  # PDFs whose chunks are in pending_*
+        failed_files: set = set()
         total_chunks = 0
         processed_files = 0
 
-        for pdf_idx, pdf in enumerate(pdfs, start=1):
+        def mark_failed(pdfs: List[Path], stage: str, err: Exception) -> None:
+            names = ", ".join(p.name for p in pdfs[:5]) + (" …" if len(pdfs) > 5 else "")
+            print(f"❌ {stage} failed for {len(pdfs)} PDF(s) [{names}]: {err}")
+            failed_files.update(pdfs)
+
+        def upload_failures() -> int:
+            """Mark PDFs of failed upserts; returns #points that didn't make it."""
+            lost = 0
+            for pdfs, n, err in points_buffer.pop_failures():
+                mark_failed(pdfs, "Upsert", err)
+                lost += n
+            return lost
+
+        def embed_pending() -> int:
+            nonlocal pending_texts, pending_payloads, pending_pdfs
+            if not pending_texts:
+                return 0
             try:
-                print(f"🔄 Processing PDF {pdf_idx}/{len(pdfs)}: {pdf.name}")
-
-                pages: List[DocumentPage] = self.loader.load_pages(pdf)
-                chunks: List[DocumentChunk] = self.chunker.split(pages)
-
-                if not chunks:
-                    print(f"⏭️  Skipped (no text): {pdf.name}")
+                vecs = self._embed(pending_texts)
+                points_buffer.add(
+                    [self._point_id(pl["doc_hash"], int(pl.get("chunk_idx", -1))) for pl in pending_payloads],
+                    vecs,
+                    pending_payloads,
+                    pending_pdfs,
+                )
+            except Exception as e:
+                # The whole batch (several PDFs) is lost, not just the current one
+                mark_failed(pending_pdfs, "Embedding", e)
+                return 0
+            finally:
+                pending_texts, pending_payloads, pending_pdfs = [], [], []
+            if len(points_buffer) < BUFFER_SIZE:
+                return 0
+            n = points_buffer.flush(self.client, self.cfg.qdrant_collection)
+            print(f"📤 Uploaded batch: {n} points")
+            return n - upload_failures()
+
+        n_workers = max(1, (os.cpu_count() or 2) - 1) if workers is None else max(1, int(workers))
+        jobs = [
+            (pdf, self.cfg.chunk_size, self.cfg.chunk_overlap, self.loader.use_ocr, self.hash_cache.lookup(pdf))
+            for pdf in pdfs
+        ]
+        print(f"⚙️  Extracting with {n_workers} worker process(es)")
+
+        # Only extracted text crosses the process boundary, never PDF bytes.
+        # forkserver/spawn: workers never fork this process (CUDA, torch and
+        # upsert threads) and import only core.io. Recycling bounds MuPDF's
+        # per-process caches without re-importing every few PDFs.
+        ctx = mp.get_context("forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn")
+        with (ctx.Pool(n_workers, maxtasksperchild=256) if n_workers > 1 else nullcontext()) as pool:
+            results = pool.imap_unordered(_load_and_chunk, jobs) if pool else map(_load_and_chunk, jobs)
+
+            for pdf_idx, (pdf, h, chunks, error) in enumerate(results, start=1):
+                mark = len(pending_texts)  # roll back this PDF's chunks on error
+                try:
+                    print(f"🔄 Processing PDF {pdf_idx}/{len(pdfs)}: {pdf.name}")
+
+                    if error:
+                        raise RuntimeError(error)
+
+                    if not chunks:
+                        print(f"⏭️  Skipped (no text): {pdf.name}")
+                        continue
+
+                    try:
+                        self.hash_cache.put(pdf, h)
+                    except OSError:
+                        pass
+
+                    # Prepare payloads and texts
+                    for c in chunks:
+                        meta = self.joiner.enrich(c.source_path, {**c.meta})
+                        base_payload = c.payload()  # expected to include chunk_idx/page/source
+                        # Normalize/augment payload to be JSON-safe & informative
+                        pl = {
+                            **base_payload,
+                            **meta,
+                            "source_path": str(base_payload.get("source_path") or c.source_path or ""),
+                            "doc_hash": h,
+                            "text": (c.text or "")[:1500],  # snippet for reranker/UI
+                        }
+                        pending_payloads.append(pl)
+                        pending_texts.append(c.text or "")
+                    pending_pdfs.append(pdf)
+
+                    processed_files += 1
+                    print(f"✅ Queued {len(chunks)} chunks from {pdf.name}")
+
+                except Exception as e:
+                    print(f"❌ Error processing {pdf.name}: {e}")
+                    del pending_texts[mark:], pending_payloads[mark:]
                     continue
 
-                h = self._hash_file(pdf)
-
-                # Prepare payloads and texts
-                payloads: List[Dict] = []
-                texts: List[str] = []
-                for c in chunks:
-                    meta = self.joiner.enrich(c.source_path, {**c.meta})
-                    base_payload = c.payload()  # expected to include chunk_idx/page/source
-                    # Normalize/augment payload to be JSON-safe & informative
-                    pl = {
-                        **base_payload,
-                        **meta,
-                        "source_path": str(base_payload.get("source_path") or c.source_path or ""),
-                        "doc_hash": h,
-                        "text": (c.text or "")[:1500],  # snippet for reranker/UI
-                    }
-                    payloads.append(pl)
-                    texts.append(c.text or "")
-
-                # Batch over encode output for throughput (4× embed_batch_size is a good start)
-                batch_size = min(len(texts), max(1, int(self.cfg.embed_batch_size) * 4))
-                for i in range(0, len(texts), batch_size):
-                    batch_texts = texts[i : i + batch_size]
-                    batch_payloads = payloads[i : i + batch_size]
-
-                    vecs = self._embed(batch_texts)
-
-                    for v, pl in zip(vecs, batch_payloads):
-                        cid = int(pl.get("chunk_idx", -1))
-                        points_buffer.append(
-                            qmodels.PointStruct(
-                                id=self._point_id(pl["doc_hash"], cid),
-                                vector=v.tolist(),
-                                payload=pl,
-                            )
-                        )
-
-                    if len(points_buffer) >= BUFFER_SIZE:
-                        self.client.upsert(
-                            collection_name=self.cfg.qdrant_collection,
-                            points=points_buffer,
-                            wait=False,
-                        )
-                        print(f"📤 Uploaded batch: {len(points_buffer)} points")
-                        total_chunks += len(points_buffer)
-                        points_buffer.clear()
-                        if self.device == "cuda":
-                            torch.cuda.empty_cache()
-
-                processed_files += 1
-                print(f"✅ Processed {len(chunks)} chunks from {pdf.name}")
-
-            except Exception as e:
-                print(f"❌ Error processing {pdf.name}: {e}")
-                continue
+                # Outside the per-PDF try: embed/upsert errors are attributed by embed_pending
+                if len(pending_texts) >= EMBED_FLUSH:
+                    total_chunks += embed_pending()
 
         # Final flush
+        total_chunks += embed_pending()
         if points_buffer:
-            self.client.upsert(
-                collection_name=self.cfg.qdrant_collection,
-                points=points_buffer,
-                wait=False,
-            )
-            print(f"📤 Final upload: {len(points_buffer)} points")
-            total_chunks += len(points_buffer)
+            n = points_buffer.flush(self.client, self.cfg.qdrant_collection)
+            print(f"📤 Final upload: {n} points")
+            total_chunks += n
+        points_buffer.drain()
+        total_chunks -= upload_failures()
+        processed_files -= len(failed_files)
 
         if self.device == "cuda":
             torch.cuda.empty_cache()
+        self.hash_cache.save()
+        if self.vec_cache is not None:
+            self.vec_cache.save()
 
         print("🎉 Indexing complete!")
         print(f"📊 Processed: {processed_files}/{len(pdfs)} files")
+        if failed_files:
+            print(f"❌ Not indexed (embedding/upsert failed): {len(failed_files)} files")
         print(f"📊 Total chunks upserted: {total_chunks}")
         print("🚀 Your German document RAG system is ready!")
 
@@ -348,10 +616,9 @@ class Indexer:
         skipped_files: List[Path] = []
         loader_no_ocr = PDFLoader(use_ocr=False)
 
-        for pdf in sorted(base.rglob("*.pdf")):
+        for pdf in sorted(iter_files(base, ".pdf")):
             try:
-                pages = loader_no_ocr.load_pages(pdf)
-                if not pages or sum(len(p.text or "") for p in pages) == 0:
+                if not loader_no_ocr.has_text(pdf):
                     skipped_files.append(pdf)
             except Exception:
                 skipped_files.append(pdf)
@@ -362,12 +629,24 @@ class Indexer:
             return
 
         # Enable OCR for this processing
-        self.loader = PDFLoader(use_ocr=True)
+        self.loader = PDFLoader(
+            use_ocr=True, ocr_workers=self.cfg.ocr_workers, ocr_processes=self.cfg.ocr_processes
+        )
 
         BUFFER_SIZE = int(self.cfg.embed_flush_chunks)
-        points_buffer: List[qmodels.PointStruct] = []
+        points_buffer = _PointBuffer()
         new_chunks_count = 0
         processed_files = 0
+        failed_files: set = set()
+
+        def upload_failures() -> int:
+            """Report PDFs of failed upserts; returns #points that didn't make it."""
+            lost = 0
+            for pdfs, n, err in points_buffer.pop_failures():
+                print(f"❌ Upsert failed for {len(pdfs)} PDF(s) [{', '.join(p.name for p in pdfs[:5])}]: {err}")
+                failed_files.update(pdfs)
+                lost += n
+            return lost
 
         for i, pdf_path in enumerate(skipped_files, start=1):
             try:
@@ -402,30 +681,19 @@ class Indexer:
                     texts.append(c.text or "")
 
                 vecs = self._embed(texts)
-
-                for v, pl in zip(vecs, payloads):
-                    cid = int(pl.get("chunk_idx", -1))
-                    points_buffer.append(
-                        qmodels.PointStruct(
-                            id=self._point_id(pl["doc_hash"], cid),
-                            vector=v.tolist(),
-                            payload=pl,
-                        )
-                    )
+                points_buffer.add(
+                    [self._point_id(pl["doc_hash"], int(pl.get("chunk_idx", -1))) for pl in payloads],
+                    vecs,
+                    payloads,
+                    [pdf_path],
+                )
 
                 if len(points_buffer) >= BUFFER_SIZE:
-                    self.client.upsert(
-                        collection_name=self.cfg.qdrant_collection,
-                        points=points_buffer,
-                        wait=False,
-                    )
-                    print(f"📤 Uploaded OCR batch: {len(points_buffer)} points")
-                    new_chunks_count += len(points_buffer)
-                    points_buffer.clear()
+                    n = points_buffer.flush(self.client, self.cfg.qdrant_collection)
+                    print(f"📤 Uploaded OCR batch: {n} points")
+                    new_chunks_count += n - upload_failures()
 
                 processed_files += 1
-                if self.device == "cuda":
-                    torch.cuda.empty_cache()
 
                 print(f"✅ Added {len(chunks)} OCR chunks from {pdf_path.name}")
 
@@ -433,15 +701,20 @@ class Indexer:
                 print(f"❌ Error processing {pdf_path.name}: {e}")
                 continue
 
+        self.loader.close()
+
         # Final batch upload
         if points_buffer:
-            self.client.upsert(
-                collection_name=self.cfg.qdrant_collection,
-                points=points_buffer,
-                wait=False,
-            )
-            print(f"📤 Final OCR upload: {len(points_buffer)} points")
-            new_chunks_count += len(points_buffer)
+            n = points_buffer.flush(self.client, self.cfg.qdrant_collection)
+            print(f"📤 Final OCR upload: {n} points")
+            new_chunks_count += n
+        points_buffer.drain()
+        new_chunks_count -= upload_failures()
+        processed_files -= len(failed_files)
+
+        self.hash_cache.save()
+        if self.vec_cache is not None:
+            self.vec_cache.save()
 
         # Basic OCR stats if PDFLoader tracks any
         if hasattr(self.loader, "get_ocr_stats"):
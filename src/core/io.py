@@ -2,23 +2,104 @@
 from __future__ import annotations
 from pathlib import Path
 from dataclasses import dataclass
-import hashlib, json, csv, logging, zipfile
+import atexit, errno, hashlib, io, json, csv, logging, mmap, os, pickle, queue, shutil, struct, sys, threading, zipfile, zlib
+from logging.handlers import QueueHandler, QueueListener
+import multiprocessing as mp
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Dict, Optional, Tuple
 
-from .domain import DocumentPage
+from .domain import DocumentChunk, DocumentPage
 
-import langdetect
-import fitz  # PyMuPDF
-import docx  # python-docx
-import pandas as pd
+# Heavy parsers (fitz, docx, pandas, langdetect, pytesseract/PIL) are imported
+# in the functions that use them, so e.g. ManifestRepo/hash_file users don't
+# pay their import time. After the first call each import is a dict lookup.
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Optional in-process tesseract bindings: one engine per thread with the
+# language data loaded once, instead of a tesseract subprocess per page
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+from .config import get_cfg
+
+CFG = get_cfg()
+
+# Optional BLAKE3 (SIMD + multithreaded) for ZIP dedup hashes
+try:
+    from blake3 import blake3 as _blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+# Optional xxHash (XXH3-128): non-cryptographic, used for ZIP identity when BLAKE3 is absent
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# Optional SIMD inflate (drop-in zlib replacements) for ZIP extraction.
+# Only members opened by ZipIngestor use it (see _open_member); zipfile's
+# own module globals stay untouched for every other user in the process.
+try:
+    from zlib_ng import zlib_ng as _fast_zlib
+except ImportError:
+    try:
+        from isal import isal_zlib as _fast_zlib
+    except ImportError:
+        _fast_zlib = None
+FAST_ZLIB_AVAILABLE = _fast_zlib is not None
 
-# OCR
-import pytesseract
-from PIL import Image
-import io
 
-from .config import CFG
+class _FastZipExtFile(zipfile.ZipExtFile):
+    """ZipExtFile whose running CRC32 uses the SIMD zlib (same checks as CPython's)."""
+
+    def _update_crc(self, newdata):
+        if self._expected_crc is None:
+            return
+        self._running_crc = _fast_zlib.crc32(newdata, self._running_crc)
+        if self._eof and self._running_crc != self._expected_crc:
+            raise zipfile.BadZipFile("Bad CRC-32 for file %r" % self.name)
+
+
+def _open_member(z: zipfile.ZipFile, member: zipfile.ZipInfo) -> zipfile.ZipExtFile:
+    """z.open(member), inflating and CRC-checking with the SIMD zlib when installed."""
+    src = z.open(member)
+    if FAST_ZLIB_AVAILABLE:
+        if member.compress_type == zipfile.ZIP_DEFLATED:
+            # Nothing has been fed to the stdlib decompressor yet
+            src._decompressor = _fast_zlib.decompressobj(-15)
+        src.__class__ = _FastZipExtFile
+    return src
+
+# Optional fastText language ID (lid.176); used instead of langdetect when the model file exists
+try:
+    import fasttext
+    FASTTEXT_AVAILABLE = True
+except ImportError:
+    FASTTEXT_AVAILABLE = False
+
+# Optional Rust-backed Excel reader (pandas engine="calamine")
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+_EXCEL_ENGINE = "calamine" if CALAMINE_AVAILABLE else None  # None = pandas default (openpyxl)
+
+# Optional streaming XLSX writer for the cleaned metadata (several times faster than openpyxl)
+try:
+    import xlsxwriter  # noqa: F401
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+_XLSX_WRITER = "xlsxwriter" if XLSXWRITER_AVAILABLE else None
 
 # Optional cleaner (keeps punctuation, fixes hyphens, etc.)
 try:
@@ -33,16 +114,213 @@ CFG.extract_dir.mkdir(parents=True, exist_ok=True)
 CFG.state_dir.mkdir(parents=True, exist_ok=True)
 CFG.metadata_dir.mkdir(parents=True, exist_ok=True)
 
-logging.basicConfig(
-    filename=str(CFG.logs_dir / "data_preparation.log"),
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(message)s",
-)
+def _setup_file_logging() -> None:
+    """
+    basicConfig-equivalent root setup for data_preparation.log, except the file
+    write happens on a QueueListener thread: logging calls from extraction/OCR
+    threads only enqueue the record. No-op if the root logger is configured.
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    file_handler = logging.FileHandler(str(CFG.logs_dir / "data_preparation.log"), encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(message)s"))
+    queue_handler = QueueHandler(queue.SimpleQueue())
+    listener = QueueListener(queue_handler.queue, file_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    root.setLevel(logging.INFO)
+    root.addHandler(queue_handler)
+
+    def _after_fork() -> None:
+        # Forked pool workers don't inherit the listener thread: write directly
+        if queue_handler in root.handlers:
+            root.removeHandler(queue_handler)
+            root.addHandler(file_handler)
+
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_after_fork)
+
+
+_setup_file_logging()
 
 # use config if present; else default
 _OCR_LANGS = getattr(CFG, "ocr_langs", "deu+eng")
 
 
+_MMAP_HASH_MAX = 1 << 30    # above this, stream instead of mapping the whole file
+_HASH_STREAM_BUF = 16 << 20
+_COPY_BUF = 1 << 20            # ZIP member extraction block size
+_NESTED_ZIP_MEM_MAX = 64 << 20  # nested archives up to this size are opened in memory
+_LANG_MIN_LETTERS = 200        # letters needed in a sample before running langdetect
+_LANG_SAMPLE_CHARS = 1000      # text sampled per file for langdetect
+_SENDFILE = sys.platform.startswith("linux") and hasattr(os, "sendfile")  # file->file sendfile
+_COPY_FILE_RANGE = _SENDFILE and hasattr(os, "copy_file_range")
+
+
+def _kernel_copy(src_fd: int, dst_fd: int, offset: int, count: int) -> None:
+    """
+    Copy `count` bytes from `src_fd` at `offset` to `dst_fd`'s current position,
+    in the kernel. copy_file_range first (can reflink / copy server-side on the
+    same filesystem), sendfile when that isn't supported for this fd pair.
+    """
+    use_range = _COPY_FILE_RANGE
+    while count:
+        try:
+            if use_range:
+                sent = os.copy_file_range(src_fd, dst_fd, count, offset)
+            else:
+                sent = os.sendfile(dst_fd, src_fd, offset, count)
+        except OSError as e:
+            if use_range and e.errno in (errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL):
+                use_range = False
+                continue
+            raise
+        if not sent:
+            raise OSError("kernel copy returned 0 before end of member")
+        offset += sent
+        count -= sent
+
+
+def hash_file(p: Path, algo: str = "sha256") -> str:
+    """
+    Hex digest of a file's contents. The file is memory-mapped and handed to
+    hashlib in one call, so hashing runs in C without the GIL (thread-pool friendly).
+    Files over 1 GiB are streamed through one reusable 16 MiB buffer instead,
+    to avoid mapping multi-GB archives into the address space.
+    algo="blake3" (optional package) hashes the mapping on all cores;
+    algo="xxh3" (optional xxhash package) is XXH3-128.
+    """
+    if algo == "blake3":
+        b3 = _blake3(max_threads=_blake3.AUTO)
+        if os.path.getsize(p):
+            b3.update_mmap(p)
+        return b3.hexdigest()
+    h = xxhash.xxh3_128() if algo == "xxh3" else hashlib.new(algo)
+    with p.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size > _MMAP_HASH_MAX:
+            buf = bytearray(_HASH_STREAM_BUF)
+            view = memoryview(buf)
+            while n := f.readinto(buf):
+                h.update(view[:n])
+        elif size:  # mmap refuses empty files
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+    return h.hexdigest()
+
+
+_lid_model = None
+
+
+def _lid():
+    """fastText LID model from CFG.lid_model_path (loaded once per process), or None for langdetect."""
+    global _lid_model
+    if _lid_model is None:
+        model = False
+        if FASTTEXT_AVAILABLE and CFG.lid_model_path.exists():
+            try:
+                model = fasttext.load_model(str(CFG.lid_model_path))
+            except Exception as e:
+                logging.warning(f"fastText LID model unusable, using langdetect: {e}")
+        _lid_model = model
+    return _lid_model or None
+
+
+_langdetect_mod = None
+
+
+def _langdetect():
+    """langdetect, imported and seeded (deterministic results across runs) on first use."""
+    global _langdetect_mod
+    if _langdetect_mod is None:
+        import langdetect
+        langdetect.DetectorFactory.seed = 0
+        _langdetect_mod = langdetect
+    return _langdetect_mod
+
+
+def iter_files(root: Path, suffix: str) -> Iterator[Path]:
+    """
+    Recursive os.scandir walk yielding files under `root` whose name ends with
+    `suffix` (case-insensitive). Unlike rglob, only matches become Path objects
+    and DirEntry's cached type info saves a stat() per entry.
+    """
+    suffix = suffix.lower()
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.lower().endswith(suffix) and entry.is_file():
+                        yield Path(entry.path)
+        except OSError:
+            continue
+
+
+class FileHashCache:
+    """
+    Persistent (path, size, mtime_ns) -> digest map under data/state, so
+    re-runs over an unchanged corpus stat() files instead of re-hashing them.
+    """
+    def __init__(self, algo: str = "sha256", path: Optional[Path] = None):
+        self.algo = algo
+        self.path = path or (CFG.state_dir / f"{algo}_stat_cache.json")
+        self._dirty = False
+        try:
+            self._entries: Dict[str, list] = json.loads(self.path.read_text("utf-8")) if self.path.exists() else {}
+        except Exception:
+            self._entries = {}
+
+    @staticmethod
+    def _key(p: Path) -> str:
+        return os.path.abspath(p)  # relative paths would collide across working dirs
+
+    def _hit(self, p: Path, st: os.stat_result) -> Optional[str]:
+        entry = self._entries.get(self._key(p))
+        if entry and (entry[0], entry[1]) == (st.st_size, st.st_mtime_ns):
+            return entry[2]
+        return None
+
+    def lookup(self, p: Path) -> Optional[str]:
+        """Cached digest if the file's size and mtime are unchanged, else None."""
+        try:
+            st = os.stat(p)
+        except OSError:
+            return None
+        return self._hit(p, st)
+
+    def put(self, p: Path, digest: str, st: Optional[os.stat_result] = None) -> None:
+        """Record `digest` for `p`; pass the stat taken *before* hashing when you have it."""
+        st = st or os.stat(p)
+        entry = [st.st_size, st.st_mtime_ns, digest]
+        key = self._key(p)
+        if self._entries.get(key) != entry:
+            self._entries[key] = entry
+            self._dirty = True
+
+    def digest(self, p: Path) -> str:
+        """Digest of `p`, hashing only on a cache miss (safe to call from threads)."""
+        st = os.stat(p)
+        cached = self._hit(p, st)
+        if cached is not None:
+            return cached
+        digest = hash_file(p, self.algo)
+        # Stat from before hashing: a file rewritten mid-hash misses next time
+        self.put(p, digest, st)
+        return digest
+
+    def save(self) -> None:
+        if self._dirty:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            tmp.write_text(json.dumps(self._entries), encoding="utf-8")
+            os.replace(tmp, self.path)  # never leave a torn cache behind
+            self._dirty = False
+
+
 @dataclass(frozen=True)
 class FileInfo:
     path: Path
@@ -52,216 +330,816 @@ class FileInfo:
 
 
 class ManifestRepo:
-    """Minimal JSON set of processed ZIP hashes (or files) under data/state."""
+    """
+    Minimal JSON set of processed ZIP hashes (or files) under data/state.
+    add() appends one line to a `.jsonl` journal next to the JSON snapshot
+    (O(1) per add); compact() folds the journal into the snapshot and runs
+    at the end of an ingest and at interpreter exit.
+    """
     def __init__(self, path: Optional[Path] = None):
         self.path = path or (CFG.state_dir / "zip_manifest.json")
+        self.journal = self.path.with_suffix(".jsonl")
+        self._seen: set = set()
         if self.path.exists():
             try:
                 self._seen = set(json.loads(self.path.read_text("utf-8")))
             except Exception:
                 self._seen = set()
-        else:
-            self._seen = set()
+        if self.journal.exists():
+            with self.journal.open(encoding="utf-8") as f:  # line by line, no full-text copy
+                self._seen.update(key for key in map(str.strip, f) if key)
+        atexit.register(self.compact)
 
     def seen(self, key: str) -> bool:
         return key in self._seen
 
+    def has_sha256_keys(self) -> bool:
+        """True if any key is a plain SHA-256 hex digest (manifests from before prefixed keys)."""
+        return any(len(k) == 64 and ":" not in k for k in self._seen)
+
     def add(self, key: str) -> None:
+        if key in self._seen:
+            return
         self._seen.add(key)
-        self.path.write_text(json.dumps(sorted(self._seen)), encoding="utf-8")
+        self.journal.parent.mkdir(parents=True, exist_ok=True)
+        with self.journal.open("a", encoding="utf-8") as f:
+            f.write(key + "\n")
+
+    def compact(self) -> None:
+        """Rewrite the sorted snapshot and drop the journal (no-op if nothing was journaled)."""
+        if not self.journal.exists():
+            return
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(sorted(self._seen)), encoding="utf-8")
+        os.replace(tmp, self.path)
+        self.journal.unlink(missing_ok=True)
+
+
+ZIP_HASH_ALGO = "blake3" if BLAKE3_AVAILABLE else ("xxh3" if XXHASH_AVAILABLE else "sha256")
+_ZIP_KEY_PREFIX = {"blake3": "b3:", "xxh3": "x3:"}
 
 
 class ZipIngestor:
-    ALLOWED_EXT = {".pdf", ".docx", ".d83", ".dwg", ".jpg", ".png", ".tiff", ".zip", ".txt"}
+    ALLOWED_EXT = frozenset({".pdf", ".docx", ".d83", ".dwg", ".jpg", ".png", ".tiff", ".zip", ".txt"})
+    TEXT_EXT = frozenset({".pdf", ".docx", ".txt"})  # sampled for language detection
     MAX_MB = 100
 
-    def __init__(self, manifest: ManifestRepo | None = None):
+    def __init__(self, manifest: ManifestRepo | None = None, hash_cache: FileHashCache | None = None):
         CFG.extract_dir.mkdir(parents=True, exist_ok=True)
         CFG.logs_dir.mkdir(parents=True, exist_ok=True)
         CFG.state_dir.mkdir(parents=True, exist_ok=True)
         self.manifest = manifest or ManifestRepo()
+        self.hash_cache = hash_cache or FileHashCache(ZIP_HASH_ALGO)
+        self._legacy_cache: Optional[FileHashCache] = None
+        self._legacy_keys: Optional[bool] = None
+        self._csv_path: Optional[Path] = None  # ingest CSV held open for the duration of run()
+        self._csv_fh = None
+        self._csv_writer = None
 
-    def _sha256(self, p: Path) -> str:
-        h = hashlib.sha256()
-        with p.open("rb") as f:
-            for chunk in iter(lambda: f.read(1 << 20), b""):
-                h.update(chunk)
-        return h.hexdigest()
+    def _zip_key(self, p: Path) -> str:
+        """Manifest key of an archive: "b3:<hex>" (BLAKE3), "x3:<hex>" (XXH3-128), plain SHA-256 hex otherwise."""
+        return _ZIP_KEY_PREFIX.get(self.hash_cache.algo, "") + self.hash_cache.digest(p)
 
-    def _sample_text(self, p: Path) -> str:
+    def _seen_as_sha256(self, p: Path) -> bool:
+        """
+        Manifest written with SHA-256 keys: match via the SHA-256 stat cache, or
+        hash the archive with SHA-256 once (only while the manifest still holds
+        such keys; the new-format key is recorded on a match).
+        """
+        if self.hash_cache.algo == "sha256":
+            return False
+        if self._legacy_keys is None:
+            self._legacy_keys = self.manifest.has_sha256_keys()
+        if not self._legacy_keys:
+            return False
+        if self._legacy_cache is None:
+            self._legacy_cache = FileHashCache("sha256")
         try:
-            if p.suffix.lower() == ".pdf":
+            sha = self._legacy_cache.digest(p)
+        except OSError:
+            return False
+        return self.manifest.seen(sha)
+
+    @staticmethod
+    def _sample_text(p: Path, ext: Optional[str] = None) -> str:
+        ext = ext or p.suffix.lower()
+        try:
+            if ext == ".pdf":
+                import fitz  # PyMuPDF
                 with fitz.open(p) as doc:
-                    return (doc[0].get_text() if len(doc) else "")[:3000]
-            if p.suffix.lower() == ".docx":
-                d = docx.Document(p)
-                return " ".join(par.text for par in d.paragraphs)[:3000]
-            if p.suffix.lower() == ".txt":
-                return p.read_text(errors="ignore")[:3000]
+                    if not len(doc):
+                        return ""
+                    # Plain extraction: no ligature/whitespace preservation, clipped to the page
+                    return doc[0].get_text("text", flags=fitz.TEXT_MEDIABOX_CLIP)[:_LANG_SAMPLE_CHARS]
+            if ext == ".docx":
+                import docx  # python-docx
+                parts, n = [], 0
+                for par in docx.Document(p).paragraphs:  # stop once the sample is full
+                    parts.append(par.text)
+                    n += len(par.text) + 1
+                    if n >= _LANG_SAMPLE_CHARS:
+                        break
+                return " ".join(parts)[:_LANG_SAMPLE_CHARS]
+            if ext == ".txt":
+                # Bounded binary head (<= 4 bytes per char of UTF-8), decoded explicitly
+                # rather than with the platform locale (cp1252 on Windows)
+                with p.open("rb") as f:
+                    return f.read(4 * _LANG_SAMPLE_CHARS).decode("utf-8", "ignore")[:_LANG_SAMPLE_CHARS]
         except Exception:
             return ""
         return ""
 
-    def _analyse_file(self, p: Path) -> FileInfo:
-        size_mb = p.stat().st_size / (1024**2)
-        if p.suffix.lower() not in self.ALLOWED_EXT:
+    @classmethod
+    def _analyse_file(cls, p: Path, size: Optional[int] = None, ext: Optional[str] = None) -> FileInfo:
+        """`size` in bytes and lower-case `ext` if the caller already has them (saves a stat())."""
+        ext = ext or p.suffix.lower()
+        size_mb = (p.stat().st_size if size is None else size) / (1024**2)
+        if ext not in cls.ALLOWED_EXT:
             return FileInfo(p, size_mb, "invalid_format")
-        if size_mb > self.MAX_MB:
+        if size_mb > cls.MAX_MB:
             return FileInfo(p, size_mb, "oversized")
         lang = ""
-        if p.suffix.lower() in {".pdf", ".docx", ".txt"}:
-            text = self._sample_text(p)
-            if text:
-                try:
-                    lang = langdetect.detect(text)
-                except Exception:
-                    lang = ""
+        if ext in cls.TEXT_EXT:
+            lang = cls._detect_lang(cls._sample_text(p, ext))
         return FileInfo(p, size_mb, "valid", lang)
 
-    def _log_row(self, row: list[str]) -> None:
+    @staticmethod
+    def _detect_lang(text: str) -> str:
+        # Skip the n-gram classifier on snippets that are mostly non-letters
+        # (scans, tables, binary noise); its guess there is meaningless anyway
+        if sum(map(str.isalpha, text[:_LANG_SAMPLE_CHARS])) < _LANG_MIN_LETTERS:
+            return ""
+        model = _lid()
+        if model is not None:
+            try:
+                labels, _ = model.predict(text.replace("\n", " "), k=1)
+                return labels[0].replace("__label__", "") if labels else ""
+            except Exception:
+                pass  # fall back to langdetect
+        try:
+            return _langdetect().detect(text)
+        except Exception:
+            return ""
+
+    def _log_rows(self, rows: List[list]) -> None:
+        """Append a batch of rows to the monthly ingest CSV, reusing the open handle."""
+        if not rows:
+            return
         csv_path = CFG.logs_dir / f"ingest_{datetime.utcnow():%Y-%m}.csv"
-        new = not csv_path.exists()
-        with csv_path.open("a", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
+        if csv_path != self._csv_path:  # first batch, or the month rolled over
+            self._close_log()
+            new = not csv_path.exists()
+            self._csv_fh = csv_path.open("a", newline="", encoding="utf-8")
+            self._csv_writer = csv.writer(self._csv_fh)
+            self._csv_path = csv_path
             if new:
-                w.writerow(["root_zip", "nested_zip", "file", "size_mb", "status", "lang"])
-            w.writerow(row)
+                self._csv_writer.writerow(["root_zip", "nested_zip", "file", "size_mb", "status", "lang"])
+        self._csv_writer.writerows(rows)
+
+    def _close_log(self) -> None:
+        if self._csv_fh is not None:
+            self._csv_fh.close()
+        self._csv_path = self._csv_fh = self._csv_writer = None
+
+    @staticmethod
+    def _copy_member(z: zipfile.ZipFile, member: zipfile.ZipInfo, out: Path) -> None:
+        """
+        Write one member to `out`. Stored (uncompressed) members are copied
+        kernel-side (copy_file_range / sendfile) on Linux, then CRC-checked over
+        a mapping of the written file (unless zip_skip_crc); everything else
+        streams through a 1 MiB buffer instead of materialising the member in memory.
+        Data goes to `<out>.part` first and replaces `out` only once it has
+        passed the CRC check, so a corrupt member never lands in extract_dir.
+        """
+        tmp = out.with_name(out.name + ".part")
+        try:
+            if not ZipIngestor._kernel_copy_member(z, member, tmp):
+                with _open_member(z, member) as src, tmp.open("wb") as dst:
+                    if CFG.zip_skip_crc:
+                        # CPython's ZipExtFile skips the running CRC32 when it has no reference value
+                        src._expected_crc = None
+                    shutil.copyfileobj(src, dst, _COPY_BUF)
+            os.replace(tmp, out)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
 
-    def _extract_zip(self, zip_path: Path, root_zip: Path) -> int:
+    @staticmethod
+    def _kernel_copy_member(z: zipfile.ZipFile, member: zipfile.ZipInfo, tmp: Path) -> bool:
+        """Stored-member fast path of _copy_member; False if it doesn't apply (caller streams instead)."""
+        if not (_SENDFILE and member.compress_type == zipfile.ZIP_STORED and member.file_size and not member.flag_bits & 0x1):
+            return False
+        try:
+            fd = z.fp.fileno()
+            hdr = os.pread(fd, 30, member.header_offset)  # local file header
+            if len(hdr) != 30 or hdr[:4] != b"PK\x03\x04":
+                return False
+            name_len, extra_len = struct.unpack("<HH", hdr[26:30])
+            offset = member.header_offset + 30 + name_len + extra_len
+            with tmp.open("w+b") as dst:
+                _kernel_copy(fd, dst.fileno(), offset, member.file_size)
+                if not CFG.zip_skip_crc:
+                    with mmap.mmap(dst.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        crc = (_fast_zlib or zlib).crc32(mm)
+                    if crc != member.CRC:
+                        raise zipfile.BadZipFile(f"Bad CRC-32 for file {member.filename!r}")
+            return True
+        except OSError:
+            return False  # fall back to the buffered copy (rewrites `tmp`)
+
+    @classmethod
+    def _extract_zip(
+        cls,
+        zip_path: Path,
+        root_zip: Path,
+        rows: List[list],
+        data: Optional[bytes] = None,
+        serial: bool = False,
+    ) -> int:
+        """
+        Extract (recursively) into extract_dir; appends one log row per file to `rows`.
+        Members are decompressed on a small thread pool (zlib and file I/O
+        release the GIL), so one large archive isn't limited to a single core;
+        `serial=True` extracts in archive order instead (members that share an
+        output path, where the last one has to win).
+        `data` holds a nested archive read into memory; `zip_path` then only names it.
+        """
         count = 0
+        # Per-member paths are plain strings (one join + normpath each); a Path is
+        # only built for members that are actually extracted and analysed
+        base = os.fspath(CFG.extract_dir)
+        names = [root_zip.name, zip_path.name]  # leading CSV columns
         try:
-            with zipfile.ZipFile(zip_path) as z:
+            with zipfile.ZipFile(zip_path if data is None else io.BytesIO(data)) as z:
+                files = []
                 for member in z.infolist():
-                    out = CFG.extract_dir / member.filename
+                    out = os.path.normpath(os.path.join(base, member.filename))
                     if member.is_dir():
-                        out.mkdir(parents=True, exist_ok=True)
-                        continue
-                    out.parent.mkdir(parents=True, exist_ok=True)
-                    with z.open(member) as src, out.open("wb") as dst:
-                        dst.write(src.read())
-                    if out.suffix.lower() == ".zip":
-                        count += self._extract_zip(out, root_zip)
+                        os.makedirs(out, exist_ok=True)
                     else:
-                        info = self._analyse_file(out)
-                        self._log_row([str(root_zip.name), str(zip_path.name), str(out), f"{info.size_mb:.2f}", info.status, info.lang])
-                        count += 1
+                        files.append((member, out, os.path.splitext(out)[1].lower()))
+                for parent in {os.path.dirname(out) for _, out, ext in files if ext in cls.ALLOWED_EXT}:
+                    os.makedirs(parent, exist_ok=True)
+
+                threads = 1 if serial else min(len(files), max(1, int(CFG.zip_member_threads)))
+                if threads <= 1:
+                    for member, out, ext in files:
+                        count += cls._extract_member(z, member, out, ext, names, root_zip, rows, serial)
+                else:
+                    with ThreadPoolExecutor(max_workers=threads) as ex:
+                        futures = [
+                            ex.submit(cls._extract_member, z, member, out, ext, names, root_zip, rows)
+                            for member, out, ext in files
+                        ]
+                        for fut in as_completed(futures):
+                            count += fut.result()
         except Exception as e:
             logging.exception(f"Corrupt zip: {zip_path} :: {e}")
         return count
 
-    def run(self) -> int:
-        """Extract all zips from raw_dir into extract_dir. Returns number of files analyzed."""
+    @classmethod
+    def _extract_member(
+        cls,
+        z: zipfile.ZipFile,
+        member: zipfile.ZipInfo,
+        out: str,
+        ext: str,
+        names: List[str],
+        root_zip: Path,
+        rows: List[list],
+        serial: bool = False,
+    ) -> int:
+        if ext not in cls.ALLOWED_EXT:
+            # Rejected by extension: log it from the central directory, never inflate it
+            size_mb = member.file_size / (1024**2)
+            rows.append([*names, out, f"{size_mb:.2f}", "invalid_format", ""])
+            return 1
+        out_path = Path(out)
+        # A bad member (CRC error, truncated data, unreadable file) costs only
+        # itself: the other members are still extracted, logged and counted
+        try:
+            if ext == ".zip" and member.file_size <= _NESTED_ZIP_MEM_MAX:
+                # Open small nested archives from memory: no write + re-read of the .zip itself
+                with _open_member(z, member) as src:
+                    data = src.read()
+                return cls._extract_zip(out_path, root_zip, rows, data, serial)
+            cls._copy_member(z, member, out_path)
+            if ext == ".zip":
+                return cls._extract_zip(out_path, root_zip, rows, serial=serial)
+            info = cls._analyse_file(out_path, member.file_size, ext)
+        except Exception as e:
+            logging.exception(f"Corrupt member: {member.filename} in {names[-1]} :: {e}")
+            return 0
+        rows.append([*names, out, f"{info.size_mb:.2f}", info.status, info.lang])
+        return 1
+
+    def run(self, processes: bool = False) -> int:
+        """
+        Extract all zips from raw_dir into extract_dir. Returns number of files analyzed.
+        Archives are extracted on a thread pool in this process (zlib, hashing and
+        file I/O release the GIL); `processes=True` uses a process pool instead,
+        for deflate-heavy corpora where the Python-side analysis becomes the limit.
+        """
         total = 0
-        for zip_path in CFG.raw_dir.rglob("*.zip"):
-            h = self._sha256(zip_path)
-            if self.manifest.seen(h):
+        zips = list(iter_files(CFG.raw_dir, ".zip"))
+        # Hash every archive up front in parallel (hashlib releases the GIL);
+        # unchanged archives are resolved from the stat cache without reading
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+            hashes = list(ex.map(self._zip_key, zips))
+        self.hash_cache.save()
+
+        todo: Dict[str, Path] = {}  # first archive per hash
+        for zip_path, h in zip(zips, hashes):
+            if self.manifest.seen(h) or h in todo:
                 logging.info(f"Skip already processed: {zip_path}")
                 continue
-            logging.info(f"Extracting {zip_path}")
-            total += self._extract_zip(zip_path, root_zip=zip_path)
-            self.manifest.add(h)
+            if self._seen_as_sha256(zip_path):
+                logging.info(f"Skip already processed (sha256 manifest entry): {zip_path}")
+                self.manifest.add(h)
+                continue
+            todo[h] = zip_path
+        if not todo:
+            return 0
+
+        # All archives extract into the one extract_dir: archives that write a
+        # common path are grouped and run in order (last one wins, as when
+        # extracting one archive at a time); disjoint groups run in parallel
+        jobs = list(todo.items())
+        base = os.fspath(CFG.extract_dir)
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+            plans = list(ex.map(lambda job: _planned_outputs(job[1], base), jobs))
+        groups, unplanned = _group_by_outputs(plans)
+
+        pool_cls = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        try:
+            with pool_cls(max_workers=min(max(len(groups), 1), os.cpu_count() or 1)) as ex:
+                futures = {
+                    ex.submit(_extract_root_zips, [(jobs[i][1], len(set(plans[i])) < len(plans[i])) for i in group]): group
+                    for group in groups
+                }
+                for fut in as_completed(futures):
+                    for i, (count, rows) in zip(futures[fut], fut.result()):
+                        self._log_rows(rows)
+                        total += count
+                        self.manifest.add(jobs[i][0])
+            # Archives whose output paths couldn't be listed: after everything
+            # else, one at a time, members in order
+            for i in unplanned:
+                count, rows = _extract_root_zips([(jobs[i][1], True)])[0]
+                self._log_rows(rows)
+                total += count
+                self.manifest.add(jobs[i][0])
+        finally:
+            self._close_log()
+        self.manifest.compact()
         return total
 
 
+def _planned_outputs(src, base: str) -> Optional[List[str]]:
+    """
+    Normalised paths under `base` that extracting archive `src` writes, nested
+    archives included (listed from memory), or None if that can't be told
+    up front (corrupt archive, nested archive too large to read into memory).
+    """
+    outs: List[str] = []
+    try:
+        with zipfile.ZipFile(src) as z:
+            for member in z.infolist():
+                if member.is_dir():
+                    continue
+                out = os.path.normpath(os.path.join(base, member.filename))
+                ext = os.path.splitext(out)[1].lower()
+                if ext not in ZipIngestor.ALLOWED_EXT:
+                    continue
+                if ext != ".zip":
+                    outs.append(os.path.normcase(out))
+                    continue
+                if member.file_size > _NESTED_ZIP_MEM_MAX:
+                    return None
+                with _open_member(z, member) as f:
+                    inner = _planned_outputs(io.BytesIO(f.read()), base)
+                if inner is None:
+                    return None
+                outs.extend(inner)
+    except Exception:
+        return None
+    return outs
+
+
+def _group_by_outputs(plans: List[Optional[List[str]]]) -> Tuple[List[List[int]], List[int]]:
+    """
+    Indices of archives grouped so that no two groups write a common path
+    (union-find over shared paths; each group keeps input order), plus the
+    indices whose plan is None.
+    """
+    parent = list(range(len(plans)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner: Dict[str, int] = {}
+    unplanned: List[int] = []
+    for i, outs in enumerate(plans):
+        if outs is None:
+            unplanned.append(i)
+            continue
+        for out in outs:
+            j = owner.setdefault(out, i)
+            if j != i:
+                parent[find(i)] = find(j)
+    groups: Dict[int, List[int]] = {}
+    for i, outs in enumerate(plans):
+        if outs is not None:
+            groups.setdefault(find(i), []).append(i)
+    return list(groups.values()), unplanned
+
+
+def _extract_root_zips(jobs: List[Tuple[Path, bool]]) -> List[Tuple[int, List[list]]]:
+    """
+    Pool worker for ZipIngestor.run: extracts (zip_path, serial) archives in
+    order; (files analysed, log rows) per archive.
+    """
+    results = []
+    for zip_path, serial in jobs:
+        logging.info(f"Extracting {zip_path}")
+        rows: List[list] = []
+        count = ZipIngestor._extract_zip(zip_path, zip_path, rows, serial=serial)
+        results.append((count, rows))
+    return results
+
+
+def _normalize_columns(columns: pd.Index) -> pd.Index:
+    """Normalize headers (e.g. " Dtad ID " -> "dtad_id") with vectorized string ops."""
+    return columns.astype(str).str.strip().str.lower().str.replace(" ", "_", regex=False)
+
+
 class ExcelCleaner:
     """Find latest Excel (recursively) in raw_dir, clean, and write cleaned_metadata to metadata_dir."""
     def run(self) -> Path:
-        exc = sorted(CFG.raw_dir.rglob("*.xlsx"), key=lambda p: p.stat().st_mtime, reverse=True)
-        if not exc:
+        # Newest workbook in one pass, no sorted list of every candidate
+        src = max(iter_files(CFG.raw_dir, ".xlsx"), key=lambda p: p.stat().st_mtime, default=None)
+        if src is None:
             raise FileNotFoundError("No .xlsx in data/raw (recursively)")
-        src = exc[0]
-        df = pd.read_excel(src)
+        import pandas as pd
+        df = pd.read_excel(src, engine=_EXCEL_ENGINE)
         df = df.dropna(how="all")
-        df.columns = [str(c).strip().lower().replace(" ", "_") for c in df.columns]
+        df.columns = _normalize_columns(df.columns)
         if "dtad_id" in df.columns:
             df["dtad_id"] = df["dtad_id"].astype(str).str.strip()
         out_csv = CFG.metadata_dir / "cleaned_metadata.csv"
         out_xlsx = CFG.metadata_dir / "cleaned_metadata.xlsx"
         df.to_csv(out_csv, index=False, encoding="utf-8-sig")
-        df.to_excel(out_xlsx, index=False)
+        # The xlsx stays the canonical output: the UI and ExcelMetadataJoiner read it
+        df.to_excel(out_xlsx, index=False, engine=_XLSX_WRITER)
         logging.info(f"Cleaned metadata written: {out_csv}")
         return out_xlsx
 
 
+# LSTM only, single text block. tessedit_do_invert=0 skips Tesseract 5's
+# second pass that re-recognises low-confidence lines as white-on-black text,
+# which scanned tender documents don't contain.
+_TESS_CONFIG = "--oem 1 --psm 6 -c tessedit_do_invert=0"
+_tess_local = threading.local()
+
+
+def _tess_api():
+    """Per-thread tesserocr engine (same setup as _TESS_CONFIG), or None to use pytesseract."""
+    if not TESSEROCR_AVAILABLE:
+        return None
+    api = getattr(_tess_local, "api", None)
+    if api is None:
+        try:
+            api = tesserocr.PyTessBaseAPI(lang=_OCR_LANGS, psm=tesserocr.PSM.SINGLE_BLOCK, oem=tesserocr.OEM.LSTM_ONLY)
+            api.SetVariable("tessedit_do_invert", "0")
+        except Exception as e:  # e.g. tessdata not found by the bindings
+            logging.warning(f"tesserocr unavailable, falling back to pytesseract: {e}")
+            api = False
+        _tess_local.api = api
+    return api or None
+
+
+# ─── OCR worker processes (PDFLoader(ocr_processes=True)) ─────────────────
+_worker_doc: Tuple[Optional[str], object] = (None, None)
+
+
+def _ocr_worker_init() -> None:
+    # One tesseract thread per worker: the pool already provides the parallelism
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+    _tess_api()  # load the tesserocr engine + tessdata at pool start, not on the first page
+
+
+def _ocr_pdf_page(pdf_path: str, page_num: int) -> str:
+    """Render + recognise one page inside a worker; the open document is kept per worker."""
+    global _worker_doc
+    path, doc = _worker_doc
+    if path != pdf_path:
+        if doc is not None:
+            doc.close()
+        _worker_doc = (None, None)
+        import fitz  # PyMuPDF
+        doc = fitz.open(pdf_path)
+        _worker_doc = (pdf_path, doc)
+    return PDFLoader._ocr_image(PDFLoader._render(doc[page_num]))
+
+
+# Pixel budget per OCR render: an A4 page at 300 DPI
+_OCR_MAX_PIXELS = 2480 * 3508
+_OCR_MIN_DPI = 150
+
+
+def _ocr_dpi(rect) -> int:
+    """CFG.ocr_dpi, lowered for large-format pages (plans, A3) to stay within _OCR_MAX_PIXELS."""
+    area_in2 = max(rect.width * rect.height, 1.0) / (72 * 72)
+    budget_dpi = int((_OCR_MAX_PIXELS / area_in2) ** 0.5)
+    return max(_OCR_MIN_DPI, min(int(CFG.ocr_dpi), budget_dpi))
+
+
 class PDFLoader:
-    """PDF loader with OCR fallback for scanned documents"""
-    def __init__(self, use_ocr: bool = True):
+    """
+    PDF loader with OCR fallback for scanned documents.
+    With ocr_workers > 1, pages are still rendered in order on the calling
+    thread (fitz isn't thread-safe) but recognised on a thread pool: the
+    tesseract subprocess / tesserocr call releases the GIL. At most
+    2 * ocr_workers rendered pages are in flight at once.
+    With ocr_processes=True, rendering moves into a process pool as well
+    (each worker opens the PDF itself).
+    Either pool is kept across PDFs (so are the per-worker tesserocr
+    engines) until close().
+    """
+    def __init__(self, use_ocr: bool = True, ocr_workers: int = 1, ocr_processes: bool = False):
         self.use_ocr = use_ocr
+        self.ocr_workers = max(1, int(ocr_workers))
+        self.ocr_processes = ocr_processes and self.ocr_workers > 1
+        if self.ocr_workers > 1:
+            # Tesseract subprocesses inherit this: one OpenMP thread each, the pool is the parallelism
+            os.environ.setdefault("OMP_THREAD_LIMIT", "1")
         self.ocr_stats = {"attempted": 0, "successful": 0, "failed": 0}
+        self._proc_pool: Optional[ProcessPoolExecutor] = None
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
 
-    def load_pages(self, pdf_path: Path) -> List[DocumentPage]:
-        pages: List[DocumentPage] = []
+    def close(self) -> None:
+        """Shut down the OCR worker threads/processes, if any were started."""
+        if self._proc_pool is not None:
+            self._proc_pool.shutdown(wait=True, cancel_futures=True)
+            self._proc_pool = None
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=True, cancel_futures=True)
+            self._thread_pool = None
+
+    def iter_pages(self, pdf_path: Path) -> Iterator[DocumentPage]:
+        """Yield cleaned pages one at a time, in page order; pages with <= 10 chars are dropped."""
+        pool = None
+        if self.use_ocr and self.ocr_processes:
+            if self._proc_pool is None:
+                # forkserver/spawn: callers (Indexer.build_ocr_only) already run
+                # torch/CUDA and upsert threads, which must not be forked
+                self._proc_pool = ProcessPoolExecutor(
+                    max_workers=min(self.ocr_workers, os.cpu_count() or 1),
+                    mp_context=mp.get_context("forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"),
+                    initializer=_ocr_worker_init,
+                )
+        elif self.use_ocr and self.ocr_workers > 1:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(max_workers=self.ocr_workers)
+            pool = self._thread_pool
+        window = 2 * self.ocr_workers
+        # (page_num, native text, OCR future or None), oldest first
+        pending: deque = deque()
         try:
+            import fitz  # PyMuPDF
             with fitz.open(pdf_path) as doc:
-                for page_num in range(len(doc)):
-                    page = doc[page_num]
-                    native_text = (page.get_text() or "").strip()
-                    text = native_text
-                    used_ocr = False
-
+                for page_num, page in enumerate(doc):
+                    text = (page.get_text("text") or "").strip()
                     # Heuristic: little/no text -> OCR
-                    if (len(native_text) < 50) and self.use_ocr:
-                        ocr_text = self._ocr_page(page, page_num, pdf_path.name)
-                        if ocr_text:
-                            text = ocr_text
-                            used_ocr = True
-
-                    # Clean text for indexing
-                    text = clean_text(text)
-
-                    if text and len(text) > 10:
-                        pages.append(
-                            DocumentPage(
-                                page_number=page_num + 1,
-                                text=text,
-                                source_path=pdf_path,
-                                meta={"loader": "pymupdf", "used_ocr": used_ocr},
-                            )
-                        )
-            return pages
+                    if (len(text) < 50) and self.use_ocr:
+                        if self._proc_pool is not None:
+                            self.ocr_stats["attempted"] += 1
+                            fut = self._proc_pool.submit(_ocr_pdf_page, os.fspath(pdf_path), page_num)
+                            pending.append((page_num, text, fut))
+                        elif pool is None:
+                            ocr_text = self._ocr_page(page, page_num, pdf_path.name)
+                            pending.append((page_num, ocr_text or text, bool(ocr_text)))
+                        else:
+                            self.ocr_stats["attempted"] += 1
+                            try:
+                                fut = pool.submit(self._ocr_image, self._render(page))
+                            except Exception as e:  # render failed: keep native text
+                                self._ocr_done(e, page_num, pdf_path.name)
+                                fut = False
+                            pending.append((page_num, text, fut))
+                    else:
+                        pending.append((page_num, text, False))
+                    while pending and (not isinstance(pending[0][2], Future) or len(pending) > window):
+                        page_out = self._finish(pdf_path, *pending.popleft())
+                        if page_out:
+                            yield page_out
+            while pending:
+                page_out = self._finish(pdf_path, *pending.popleft())
+                if page_out:
+                    yield page_out
+        finally:
+            for _, _, fut in pending:  # abandoned early (e.g. has_text): drop queued pages
+                if isinstance(fut, Future):
+                    fut.cancel()
+
+    def _finish(self, pdf_path: Path, page_num: int, text: str, ocr) -> Optional[DocumentPage]:
+        """Resolve a queued page (`ocr`: Future, or whether `text` already is OCR output)."""
+        used_ocr = bool(ocr)
+        if isinstance(ocr, Future):
+            ocr_text = self._ocr_result(ocr, page_num, pdf_path.name)
+            used_ocr = bool(ocr_text)
+            text = ocr_text or text
+
+        # Clean text for indexing
+        text = clean_text(text)
+
+        if text and len(text) > 10:
+            return DocumentPage(
+                page_number=page_num + 1,
+                text=text,
+                source_path=pdf_path,
+                meta={"loader": "pymupdf", "used_ocr": used_ocr},
+            )
+        return None
+
+    def load_pages(self, pdf_path: Path) -> List[DocumentPage]:
+        try:
+            return list(self.iter_pages(pdf_path))
         except Exception as e:
             logging.error(f"Error loading PDF {pdf_path}: {e}")
             return []
 
+    def has_text(self, pdf_path: Path) -> bool:
+        """True as soon as one page yields indexable text (stops parsing there)."""
+        try:
+            return next(iter(self.iter_pages(pdf_path)), None) is not None
+        except Exception as e:
+            logging.error(f"Error loading PDF {pdf_path}: {e}")
+            return False
+
     def _ocr_page(self, page, page_num: int, filename: str) -> str:
-        """Extract text from page using OCR (pytesseract fallback)"""
+        """Extract text from page using OCR (in-process tesserocr if installed, else pytesseract)"""
         self.ocr_stats["attempted"] += 1
         try:
-            # 300 DPI render is a good balance
-            pix = page.get_pixmap(dpi=300)
-            img_data = pix.tobytes("png")
-            del pix
+            text = self._ocr_image(self._render(page))
+        except Exception as e:
+            text = e
+        return self._ocr_done(text, page_num, filename)
 
-            image = Image.open(io.BytesIO(img_data))
-            try:
-                text = pytesseract.image_to_string(
-                    image,
-                    lang=_OCR_LANGS,
-                    config="--oem 1 --psm 6",
-                )
-            finally:
-                image.close()
-
-            text = (text or "").strip()
-            if len(text) >= 20:
-                self.ocr_stats["successful"] += 1
-                logging.info(f"OCR extracted {len(text)} chars from {filename} p{page_num + 1}")
-                return text
-            return ""
+    def _ocr_result(self, fut: Future, page_num: int, filename: str) -> str:
+        try:
+            text = fut.result()
         except Exception as e:
+            text = e
+        return self._ocr_done(text, page_num, filename)
+
+    def _ocr_done(self, text, page_num: int, filename: str) -> str:
+        """Stats/logging for one OCR attempt (`text` may be the exception raised)."""
+        if isinstance(text, Exception):
             self.ocr_stats["failed"] += 1
-            logging.error(f"OCR failed on {filename} page {page_num + 1}: {e}")
+            logging.error(f"OCR failed on {filename} page {page_num + 1}: {text}")
             return ""
+        text = (text or "").strip()
+        if len(text) >= 20:
+            self.ocr_stats["successful"] += 1
+            logging.info(f"OCR extracted {len(text)} chars from {filename} p{page_num + 1}")
+            return text
+        return ""
+
+    @staticmethod
+    def _render(page) -> Tuple[bytes, int, int, int, int]:
+        """8-bit gray, no alpha raster of `page` as (samples, width, height, stride, dpi)."""
+        # pix.samples is the one copy made: it detaches the raster from the
+        # (not thread-safe) fitz objects before it is handed to an OCR thread
+        import fitz  # PyMuPDF
+        dpi = _ocr_dpi(page.rect)
+        pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False)
+        return pix.samples, pix.width, pix.height, pix.stride, dpi
+
+    @staticmethod
+    def _ocr_image(raster: Tuple[bytes, int, int, int, int]) -> str:
+        """Recognise one rendered page (thread-safe)."""
+        samples, width, height, stride, dpi = raster
+        api = _tess_api()
+        if api is not None:
+            # Raw 1-byte-per-pixel buffer straight into libtesseract, no PIL image.
+            # A raw buffer carries no resolution, so pass the render DPI explicitly
+            api.SetImageBytes(samples, width, height, 1, stride)
+            api.SetSourceResolution(dpi)
+            return api.GetUTF8Text()
+        import pytesseract
+        from PIL import Image
+        # frombuffer shares `samples` instead of copying it
+        image = Image.frombuffer("L", (width, height), samples, "raw", "L", stride, 1)
+        try:
+            return pytesseract.image_to_string(
+                image,
+                lang=_OCR_LANGS,
+                config=f"{_TESS_CONFIG} --dpi {dpi}",
+            )
+        finally:
+            image.close()
 
     def get_ocr_stats(self) -> Dict[str, int]:
         return self.ocr_stats.copy()
 
 
+# ─── Chunking (also the Indexer.build pool worker) ────────────────────────
+class PageAwareChunker:
+    def __init__(self, size: int, overlap: int):
+        self.size, self.overlap = size, overlap
+
+    def split(self, pages: Iterable[DocumentPage]) -> List[DocumentChunk]:
+        """Single pass over `pages` (a list or a lazy PDFLoader.iter_pages stream)."""
+        source_path: Optional[Path] = None
+        text_acc: List[str] = []
+        page_acc: List[int] = []
+        acc_len = 0  # == sum(len(x) for x in text_acc)
+        chunks: List[DocumentChunk] = []
+        idx = 0
+
+        def flush():
+            nonlocal idx, text_acc, page_acc, acc_len
+            if not text_acc:
+                return
+            text = "".join(text_acc)
+            page_start, page_end = (page_acc[0], page_acc[-1]) if page_acc else (None, None)
+            chunks.append(
+                DocumentChunk(
+                    chunk_index=idx,
+                    text=text,
+                    source_path=source_path,
+                    page_start=page_start,
+                    page_end=page_end,
+                    meta={},
+                )
+            )
+            idx += 1
+            keep = text[-self.overlap:] if self.overlap > 0 else ""
+            text_acc = [keep] if keep else []
+            acc_len = len(keep)
+            page_acc = [page_end] if (self.overlap > 0 and page_end is not None) else []
+
+        for p in pages:
+            t = p.text or ""
+            if not t:
+                continue
+            if source_path is None:
+                source_path = p.source_path
+            cursor = 0
+            while cursor < len(t):
+                space_left = self.size - acc_len
+                if space_left <= 0:
+                    flush()
+                    space_left = self.size
+                take = t[cursor : cursor + space_left]
+                text_acc.append(take)
+                acc_len += len(take)
+                # pages arrive in order, so a repeat can only be the last entry (O(1) dedup)
+                if not page_acc or page_acc[-1] != p.page_number:
+                    page_acc.append(p.page_number)
+                cursor += len(take)
+        flush()
+        return chunks
+
+
+def _hash_file(pdf_path: Path) -> str:
+    """Robust file hash (fallback to path string if read fails)."""
+    try:
+        return hash_file(pdf_path, "sha1")  # sha1 keeps point ids stable across versions
+    except Exception:
+        return hashlib.sha1(str(pdf_path).encode("utf-8")).hexdigest()
+
+
+def _load_and_chunk(
+    job: Tuple[Path, int, int, bool, Optional[str]],
+) -> Tuple[Path, Optional[str], List[DocumentChunk], Optional[str]]:
+    """
+    Pool worker for Indexer.build: PDF -> (path, doc_hash, chunks, error).
+    Lives here rather than in core.index so spawned/forkserver workers import
+    only this module, never torch, sentence-transformers or qdrant-client.
+    `known_hash` comes from the parent's stat cache; hash only if it's None.
+    """
+    pdf, size, overlap, use_ocr, known_hash = job
+    try:
+        # Pages stream straight into the chunker; no per-PDF page list
+        pages = PDFLoader(use_ocr=use_ocr).iter_pages(pdf)
+        chunks: List[DocumentChunk] = PageAwareChunker(size, overlap).split(pages)
+        return pdf, ((known_hash or _hash_file(pdf)) if chunks else None), chunks, None
+    except Exception as e:
+        return pdf, None, [], str(e)
+
+
 class ExcelMetadataJoiner:
     """Join cleaned Excel metadata onto payloads by dtad_id or filename stem."""
     def __init__(self, cleaned_path: Path | None = None):
         self.cleaned_path = Path(cleaned_path) if cleaned_path else (CFG.metadata_dir / "cleaned_metadata.xlsx")
         self._map: dict[str, dict] = {}
+        self._stem_keys: dict[str, str] = {}  # path -> digits key; enrich() runs once per chunk
+        self.cache_path = CFG.state_dir / "metadata_map.pkl"
         self._loaded = False
 
     def _load_once(self):
@@ -272,23 +1150,48 @@ class ExcelMetadataJoiner:
             if not self.cleaned_path.exists():
                 logging.warning(f"ExcelMetadataJoiner: missing {self.cleaned_path}, continuing without metadata.")
                 return
-            df = pd.read_excel(self.cleaned_path)
+            st = self.cleaned_path.stat()
+            stamp = (os.path.abspath(self.cleaned_path), st.st_size, st.st_mtime_ns)
+            cached = self._read_cache(stamp)
+            if cached is not None:
+                self._map = cached
+                return
+            import pandas as pd
+            df = pd.read_excel(self.cleaned_path, engine=_EXCEL_ENGINE)
             if df.empty:
                 logging.warning(f"ExcelMetadataJoiner: {self.cleaned_path} is empty, continuing without metadata.")
                 return
-            df.columns = [str(c).strip().lower().replace(" ", "_") for c in df.columns]
+            df.columns = _normalize_columns(df.columns)
             if "dtad_id" in df.columns:
+                df = df.loc[df["dtad_id"].notna()].copy()
                 df["dtad_id"] = df["dtad_id"].astype(str).str.strip()
-                self._map = {
-                    str(row["dtad_id"]).strip(): row.to_dict()
-                    for _, row in df.iterrows()
-                    if pd.notna(row.get("dtad_id", None))
-                }
+                # Column-wise to_dict instead of iterrows; later duplicates win as before
+                self._map = dict(zip(df["dtad_id"], df.to_dict(orient="records")))
+                self._write_cache(stamp)
             else:
                 logging.warning("ExcelMetadataJoiner: no 'dtad_id' column found.")
         except Exception as e:
             logging.exception(f"ExcelMetadataJoiner: failed to read {self.cleaned_path}: {e}")
 
+    # Parsed map is pickled under state_dir, keyed on the xlsx's (path, size, mtime_ns),
+    # so indexer runs over unchanged metadata skip read_excel entirely
+    def _read_cache(self, stamp: tuple) -> Optional[dict]:
+        try:
+            with self.cache_path.open("rb") as f:
+                blob = pickle.load(f)
+            return blob["map"] if blob.get("stamp") == stamp else None
+        except Exception:
+            return None
+
+    def _write_cache(self, stamp: tuple) -> None:
+        try:
+            tmp = self.cache_path.with_name(self.cache_path.name + ".tmp")
+            with tmp.open("wb") as f:
+                pickle.dump({"stamp": stamp, "map": self._map}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.cache_path)
+        except Exception as e:
+            logging.warning(f"ExcelMetadataJoiner: could not write cache {self.cache_path}: {e}")
+
     def enrich(self, path: Path, meta: dict) -> dict:
         """Attach row data if we can match by dtad_id or filename digits."""
         self._load_once()
@@ -297,11 +1200,24 @@ class ExcelMetadataJoiner:
 
         key = str(meta.get("dtad_id", "")).strip()
         if not key:
-            stem_digits = "".join(ch for ch in Path(path).stem if ch.isdigit())
-            key = stem_digits[:8] if len(stem_digits) >= 8 else stem_digits
+            key = self._stem_key(path)
 
-        if key and key in self._map:
-            merged = {**meta, **self._map[key]}
+        row = self._map.get(key) if key else None
+        if row is None and key.startswith("0"):
+            # Filename digits often carry zero padding the sheet's ids don't
+            key = key.lstrip("0")
+            row = self._map.get(key) if key else None
+        if row is not None:
+            merged = {**meta, **row}
             merged["dtad_id"] = key
             return merged
         return meta
+
+    def _stem_key(self, path: Path) -> str:
+        """First 8 digits of the filename stem, computed once per path."""
+        spath = str(path)
+        key = self._stem_keys.get(spath)
+        if key is None:
+            stem_digits = "".join(filter(str.isdigit, Path(spath).stem))
+            key = self._stem_keys[spath] = stem_digits[:8]
+        return key
@@ -1,12 +1,18 @@
 # core/logger.py
 from __future__ import annotations
 
+import atexit
 import csv
 import json
 import logging
+import os
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
 
 try:
     import torch  # optional; used for GPU flag in summary
@@ -14,18 +20,160 @@ try:
 except Exception:
     TORCH_AVAILABLE = False
 
-from .config import CFG
+try:
+    import psutil  # optional; used for cached system samples in perf snapshots
+    PSUTIL_AVAILABLE = True
+except Exception:
+    PSUTIL_AVAILABLE = False
+
+try:
+    import orjson  # optional; faster JSON for the session summary
+    ORJSON_AVAILABLE = True
+except Exception:
+    ORJSON_AVAILABLE = False
+
+from .config import get_cfg
+
+CFG = get_cfg()
+
+
+def _write_json(path: Path, obj: Any) -> None:
+    """Pretty-print `obj` to `path` (orjson if installed, else stdlib json)."""
+    if ORJSON_AVAILABLE:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+
+COMPONENT_LOGGERS = ("ingestion", "embedding", "ocr", "evaluation", "performance", "errors")
+
+class _FlushMarker:
+    """Queued behind pending records; the listener sets `done` when it reaches it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class _FlushableQueueListener(QueueListener):
+    """QueueListener with flush(): wait until every record queued so far is written."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.running = False
+
+    def start(self):
+        super().start()
+        self.running = True
+
+    def stop(self):
+        self.running = False
+        super().stop()
+
+    def handle(self, record):
+        if isinstance(record, _FlushMarker):
+            record.done.set()
+            return
+        super().handle(record)
+
+    def flush(self, timeout: float = 5.0) -> None:
+        if not self.running:
+            return
+        marker = _FlushMarker()
+        self.queue.put_nowait(marker)
+        marker.done.wait(timeout)
+
+
+# Process-wide: logging.getLogger() names are global, so handlers are set up once
+_log_listener: Optional[_FlushableQueueListener] = None
+
+
+# ---------- CSV schemas ----------
+INGESTION_SUMMARY_HEADER = ["timestamp", "zip_file", "files_extracted", "size_mb", "status", "error"]
+PDF_DETAILS_HEADER = ["timestamp", "pdf_file", "pages", "text_chars", "time_s", "status"]
+EMBEDDING_BATCHES_HEADER = ["timestamp", "batch_id", "chunk_count", "processing_time", "gpu_memory_mb", "avg_embedding_norm"]
+OCR_RESULTS_HEADER = ["timestamp", "file_name", "page_number", "ocr_confidence", "text_length", "processing_time", "success"]
+EVALUATION_RESULTS_HEADER = [
+    "timestamp", "query", "query_language", "hit_rate", "mrr",
+    "context_precision", "faithfulness", "answer_relevancy",
+    "response_time", "retrieved_docs_count"
+]
+SYSTEM_PERFORMANCE_HEADER = ["timestamp", "stage", "cpu_percent", "memory_mb", "gpu_memory_mb"]
+
+
+class _SysSampler:
+    """
+    Background sampler for system metrics.
+
+    Refreshes a cached snapshot every `interval_s` so checkpoint logging reads a
+    dict instead of making psutil syscalls. CPU percent is computed from
+    cpu_times() deltas, which avoids cpu_percent()'s internal sampling; the
+    first sample is taken one interval after start (a delta over ~0 s would
+    read as 0%), and snapshot() waits for it.
+    """
+
+    def __init__(self, interval_s: float = 0.5):
+        self.interval_s = interval_s
+        self._lock = threading.Lock()
+        self._cached_stats: Dict[str, float] = {}
+        self._ready = threading.Event()
+        self._prev_times = psutil.cpu_times()
+        # Slow-changing totals are read once
+        self.total_memory_mb = psutil.virtual_memory().total / 1024**2
+        self.disk_total_gb = psutil.disk_usage(".").total / 1024**3
+        threading.Thread(target=self._run, name="rag-sys-sampler", daemon=True).start()
+
+    def _cpu_percent(self) -> float:
+        now = psutil.cpu_times()
+        prev, self._prev_times = self._prev_times, now
+        idle = (now.idle - prev.idle) + (getattr(now, "iowait", 0.0) - getattr(prev, "iowait", 0.0))
+        total = sum(now) - sum(prev)
+        return 100.0 * (total - idle) / total if total > 0 else 0.0
+
+    def _sample(self):
+        vm = psutil.virtual_memory()
+        stats = {
+            "cpu_percent": self._cpu_percent(),
+            "memory_used_mb": vm.used / 1024**2,
+            "memory_available_mb": vm.available / 1024**2,
+            "disk_free_gb": psutil.disk_usage(".").free / 1024**3,
+        }
+        with self._lock:
+            self._cached_stats = stats
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval_s)
+            try:
+                self._sample()
+            except Exception:
+                pass
+            finally:
+                self._ready.set()
+
+    def snapshot(self) -> Dict[str, float]:
+        self._ready.wait(2 * self.interval_s)  # only blocks during the first interval
+        with self._lock:
+            return self._cached_stats
 
 
 class ComprehensiveRAGLogger:
     """Structured logging for all RAG pipeline stages."""
 
+    # CSV rows are queued by the log_* methods and written by one background
+    # thread, in batches of up to CSV_BATCH_ROWS or every CSV_BATCH_TIMEOUT_S.
+    CSV_BATCH_ROWS = 256
+    CSV_BATCH_TIMEOUT_S = 0.1
+    CSV_BUFFER_BYTES = 1 << 16
+
     def __init__(self, session_id: Optional[str] = None):
         self.session_id = session_id or datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         self.logs_root = Path(CFG.logs_dir) / f"session_{self.session_id}"
         self._ensure_dirs()
         self._setup_loggers()
+        self._setup_csv_writer()
         self._init_stats()
+        self._ts_cache = (0, "")  # (epoch second, isoformat) shared by CSV rows
 
     # ---------- setup ----------
 
@@ -37,31 +185,73 @@ class ComprehensiveRAGLogger:
             (self.logs_root / d).mkdir(parents=True, exist_ok=True)
 
     def _setup_loggers(self):
+        # File/stream handlers run on one QueueListener thread per process;
+        # log calls from pipeline threads only enqueue the record.
+        global _log_listener
+        if _log_listener is None:
+            _log_listener = self._start_log_listener()
+
+        # Component loggers
+        self.ingestion_logger   = logging.getLogger("ingestion")
+        self.embedding_logger   = logging.getLogger("embedding")
+        self.ocr_logger         = logging.getLogger("ocr")
+        self.evaluation_logger  = logging.getLogger("evaluation")
+        self.performance_logger = logging.getLogger("performance")
+        self.errors_logger      = logging.getLogger("errors")
+
+    def _start_log_listener(self) -> _FlushableQueueListener:
+        log_q: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+        handlers: List[logging.Handler] = []
+        for name in COMPONENT_LOGGERS:
+            fh = logging.FileHandler(self.logs_root / name / f"{name}.log", encoding="utf-8")
+            fh.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(message)s"))
+            fh.addFilter(logging.Filter(name))  # route only this component's records
+            handlers.append(fh)
+            logging.getLogger(name).setLevel(logging.INFO)
+
         # Root/system logger once
         root = logging.getLogger()
         if not root.handlers:
             root.setLevel(logging.INFO)
             root_handler = logging.FileHandler(self.logs_root / "system" / "main.log", encoding="utf-8")
             root_handler.setFormatter(logging.Formatter("%(asctime)s | %(name)s | %(levelname)s | %(message)s"))
-            root.addHandler(root_handler)
-            root.addHandler(logging.StreamHandler())
-
-        # Component loggers (idempotent)
-        self.ingestion_logger   = self._component_logger("ingestion")
-        self.embedding_logger   = self._component_logger("embedding")
-        self.ocr_logger         = self._component_logger("ocr")
-        self.evaluation_logger  = self._component_logger("evaluation")
-        self.performance_logger = self._component_logger("performance")
-        self.errors_logger      = self._component_logger("errors")
-
-    def _component_logger(self, name: str) -> logging.Logger:
-        logger = logging.getLogger(name)
-        if not any(isinstance(h, logging.FileHandler) and getattr(h, "baseFilename", "").endswith(f"{name}.log") for h in logger.handlers):
-            fh = logging.FileHandler(self.logs_root / name / f"{name}.log", encoding="utf-8")
-            fh.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(message)s"))
-            logger.addHandler(fh)
-            logger.setLevel(logging.INFO)
-        return logger
+            handlers += [root_handler, logging.StreamHandler()]
+            # Component records reach the queue by propagating to root
+            root.addHandler(QueueHandler(log_q))
+        else:
+            # Root belongs to the host app; feed only our components into the queue
+            for name in COMPONENT_LOGGERS:
+                logging.getLogger(name).addHandler(QueueHandler(log_q))
+
+        listener = _FlushableQueueListener(log_q, *handlers, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        return listener
+
+    def _drain_log_queue(self):
+        """Wait until the listener has written every queued log record."""
+        if _log_listener is not None:
+            _log_listener.flush()
+
+    def _setup_csv_writer(self):
+        # Stream name -> CSV path, built once; log_* calls reuse these Path objects
+        self._csv_paths: Dict[str, Path] = {
+            stream: self.logs_root / folder / f"{stream}.csv"
+            for folder, stream in (
+                ("ingestion", "ingestion_summary"), ("ingestion", "pdf_details"),
+                ("embedding", "embedding_batches"), ("ocr", "ocr_results"),
+                ("evaluation", "evaluation_results"), ("performance", "system_performance"),
+            )
+        }
+        # Streams whose rows are numbers + the ISO timestamp only: nothing to quote,
+        # so the writer thread joins them directly instead of going through csv.writer
+        self._plain_csv = {self._csv_paths["embedding_batches"]}
+        # path -> (file handle, csv.writer); only touched by the writer thread
+        self._csv_files: Dict[Path, Any] = {}
+        self._csv_q: "queue.Queue[tuple]" = queue.Queue()
+        self._csv_thread = threading.Thread(target=self._drain_csv_queue, name="rag-csv-writer", daemon=True)
+        self._csv_thread.start()
+        atexit.register(self.close)
 
     def _init_stats(self):
         self.stats: Dict[str, Dict[str, Any]] = {
@@ -71,8 +261,104 @@ class ComprehensiveRAGLogger:
             "evaluation":{"queries_tested": 0, "avg_retrieval_score": 0.0, "avg_generation_score": 0.0},
         }
 
+    # ---------- csv writer ----------
+
+    def _csv_reset(self, path: Path, header: List[str]):
+        """Truncate `path` and write its header row (used by the *_start methods)."""
+        self._csv_q.put(("reset", path, header, None))
+
+    def _csv_row(self, path: Path, header: List[str], row: List[Any]):
+        """Queue one row; the header is written if the file is opened empty."""
+        self._csv_q.put(("row", path, header, row))
+
+    def flush(self):
+        """Block until every queued CSV row is on disk."""
+        self._sync(close=False)
+
+    def close(self):
+        """Flush and close all CSV handles; later rows reopen their file in append mode."""
+        self._sync(close=True)
+
+    def _sync(self, close: bool):
+        if not self._csv_thread.is_alive():
+            return
+        done = threading.Event()
+        self._csv_q.put(("sync", None, None, (done, close)))
+        done.wait()
+
+    def _drain_csv_queue(self):
+        while True:
+            batch = [self._csv_q.get()]
+            deadline = time.monotonic() + self.CSV_BATCH_TIMEOUT_S
+            while len(batch) < self.CSV_BATCH_ROWS:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._csv_q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._write_csv_batch(batch)
+            except Exception:
+                logging.getLogger(__name__).exception("CSV writer failed")
+            finally:
+                for kind, _, _, payload in batch:
+                    if kind == "sync":
+                        payload[0].set()
+
+    def _write_csv_batch(self, batch: List[tuple]):
+        pending: Dict[Path, tuple] = {}
+        for kind, path, header, payload in batch:
+            if kind == "row":
+                pending.setdefault(path, (header, []))[1].append(payload)
+                continue
+            self._write_pending(pending)
+            if kind == "reset":
+                self._open_csv(path, header, truncate=True)
+            elif kind == "sync":
+                for fp, _ in self._csv_files.values():
+                    fp.flush()
+                    os.fsync(fp.fileno())
+                if payload[1]:
+                    for fp, _ in self._csv_files.values():
+                        fp.close()
+                    self._csv_files.clear()
+        self._write_pending(pending)
+
+    def _write_pending(self, pending: Dict[Path, tuple]):
+        for path, (header, rows) in pending.items():
+            entry = self._csv_files.get(path) or self._open_csv(path, header)
+            if path in self._plain_csv:
+                # Same bytes csv.writer would produce (str() of each field, "\r\n" terminator)
+                entry[0].write("".join(",".join(map(str, r)) + "\r\n" for r in rows))
+            else:
+                entry[1].writerows(rows)
+            entry[0].flush()
+        pending.clear()
+
+    def _open_csv(self, path: Path, header: List[str], truncate: bool = False):
+        old = self._csv_files.pop(path, None)
+        if old:
+            old[0].close()
+        fp = path.open("w" if truncate else "a", newline="", encoding="utf-8", buffering=self.CSV_BUFFER_BYTES)
+        w = csv.writer(fp)
+        if truncate or fp.tell() == 0:
+            w.writerow(header)
+        self._csv_files[path] = (fp, w)
+        return self._csv_files[path]
+
     # ---------- utilities ----------
 
+    def _now_str(self) -> str:
+        """Second-resolution ISO timestamp, formatted once per second."""
+        sec = int(time.time())
+        cached_sec, cached_str = self._ts_cache
+        if sec != cached_sec:
+            cached_str = datetime.fromtimestamp(sec).isoformat()
+            self._ts_cache = (sec, cached_str)
+        return cached_str
+
     def log_error(self, component: str, message: str, exc: Optional[BaseException] = None):
         """Centralized error logging."""
         msg = f"{component.upper()}: {message}"
@@ -84,21 +370,16 @@ class ComprehensiveRAGLogger:
 
     def log_ingestion_start(self, zip_count: int, total_size_mb: float):
         self.ingestion_logger.info(f"🚀 INGESTION STARTED - {zip_count} ZIP files, {total_size_mb:.1f}MB total")
-        path = self.logs_root / "ingestion" / "ingestion_summary.csv"
-        with path.open("w", newline="", encoding="utf-8") as f:
-            csv.writer(f).writerow(["timestamp", "zip_file", "files_extracted", "size_mb", "status", "error"])
+        self._csv_reset(self._csv_paths["ingestion_summary"], INGESTION_SUMMARY_HEADER)
 
     def log_pdf_processed(self, pdf_path: Path, pages_count: int, text_length: int, processing_time: float):
         self.ingestion_logger.info(
             f"✅ PDF: {pdf_path.name} | Pages:{pages_count} | Text:{text_length} chars | Time:{processing_time:.2f}s"
         )
-        path = self.logs_root / "ingestion" / "pdf_details.csv"
-        new_file = not path.exists()
-        with path.open("a", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            if new_file:
-                w.writerow(["timestamp", "pdf_file", "pages", "text_chars", "time_s", "status"])
-            w.writerow([datetime.now().isoformat(), pdf_path.name, pages_count, text_length, processing_time, "success"])
+        self._csv_row(
+            self._csv_paths["pdf_details"], PDF_DETAILS_HEADER,
+            [self._now_str(), pdf_path.name, pages_count, text_length, processing_time, "success"],
+        )
         self.stats["ingestion"]["files_processed"] += 1
 
     # ---------- embedding ----------
@@ -106,17 +387,16 @@ class ComprehensiveRAGLogger:
     def log_embedding_start(self, total_chunks: int, batch_size: int, gpu_enabled: bool):
         device = "GPU" if gpu_enabled else "CPU"
         self.embedding_logger.info(f"🚀 EMBEDDING STARTED - {total_chunks} chunks, batch_size={batch_size}, device={device}")
-        path = self.logs_root / "embedding" / "embedding_batches.csv"
-        with path.open("w", newline="", encoding="utf-8") as f:
-            csv.writer(f).writerow(["timestamp", "batch_id", "chunk_count", "processing_time", "gpu_memory_mb", "avg_embedding_norm"])
+        self._csv_reset(self._csv_paths["embedding_batches"], EMBEDDING_BATCHES_HEADER)
 
     def log_embedding_batch(self, batch_id: int, chunk_count: int, processing_time: float, gpu_memory_mb: float, avg_norm: float):
         self.embedding_logger.info(
             f"📤 Batch {batch_id}: {chunk_count} chunks | Time:{processing_time:.2f}s | GPU Mem:{gpu_memory_mb:.1f}MB | Norm:{avg_norm:.3f}"
         )
-        path = self.logs_root / "embedding" / "embedding_batches.csv"
-        with path.open("a", newline="", encoding="utf-8") as f:
-            csv.writer(f).writerow([datetime.now().isoformat(), batch_id, chunk_count, processing_time, gpu_memory_mb, avg_norm])
+        self._csv_row(
+            self._csv_paths["embedding_batches"], EMBEDDING_BATCHES_HEADER,
+            [self._now_str(), batch_id, chunk_count, processing_time, gpu_memory_mb, avg_norm],
+        )
         self.stats["embedding"]["chunks_embedded"] += chunk_count
         self.stats["embedding"]["gpu_batches"] += 1
 
@@ -124,22 +404,17 @@ class ComprehensiveRAGLogger:
 
     def log_ocr_start(self, files_for_ocr: int):
         self.ocr_logger.info(f"🔍 OCR STARTED - {files_for_ocr} files require OCR processing")
-        path = self.logs_root / "ocr" / "ocr_results.csv"
-        with path.open("w", newline="", encoding="utf-8") as f:
-            csv.writer(f).writerow(["timestamp", "file_name", "page_number", "ocr_confidence", "text_length", "processing_time", "success"])
+        self._csv_reset(self._csv_paths["ocr_results"], OCR_RESULTS_HEADER)
 
     def log_ocr_page(self, file_name: str, page_num: int, text_length: int, confidence: float, processing_time: float, success: bool):
         status = "✅" if success else "❌"
         self.ocr_logger.info(
             f"{status} OCR: {file_name} p{page_num} | Chars:{text_length} | Conf:{confidence:.2f} | Time:{processing_time:.2f}s"
         )
-        path = self.logs_root / "ocr" / "ocr_results.csv"
-        new_file = not path.exists()
-        with path.open("a", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            if new_file:
-                w.writerow(["timestamp", "file_name", "page_number", "ocr_confidence", "text_length", "processing_time", "success"])
-            w.writerow([datetime.now().isoformat(), file_name, page_num, confidence, text_length, processing_time, success])
+        self._csv_row(
+            self._csv_paths["ocr_results"], OCR_RESULTS_HEADER,
+            [self._now_str(), file_name, page_num, confidence, text_length, processing_time, success],
+        )
         self.stats["ocr"]["pages_attempted"] += 1
         if success:
             self.stats["ocr"]["pages_successful"] += 1
@@ -149,59 +424,63 @@ class ComprehensiveRAGLogger:
 
     def log_evaluation_start(self, test_queries: int, metrics_used: List[str]):
         self.evaluation_logger.info(f"📊 EVALUATION STARTED - {test_queries} queries, metrics: {', '.join(metrics_used)}")
-        path = self.logs_root / "evaluation" / "evaluation_results.csv"
-        with path.open("w", newline="", encoding="utf-8") as f:
-            csv.writer(f).writerow([
-                "timestamp", "query", "query_language", "hit_rate", "mrr",
-                "context_precision", "faithfulness", "answer_relevancy",
-                "response_time", "retrieved_docs_count"
-            ])
+        self._csv_reset(self._csv_paths["evaluation_results"], EVALUATION_RESULTS_HEADER)
 
     def log_evaluation_query(self, query: str, metrics: Dict[str, float]):
         self.evaluation_logger.info(
             f"🎯 Query: '{query[:50]}…' | Hit Rate:{metrics.get('hit_rate',0):.3f} | Faithfulness:{metrics.get('faithfulness',0):.3f}"
         )
-        path = self.logs_root / "evaluation" / "evaluation_results.csv"
-        new_file = not path.exists()
-        with path.open("a", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            if new_file:
-                w.writerow([
-                    "timestamp", "query", "query_language", "hit_rate", "mrr",
-                    "context_precision", "faithfulness", "answer_relevancy",
-                    "response_time", "retrieved_docs_count"
-                ])
-            w.writerow([
-                datetime.now().isoformat(),
-                query,
-                metrics.get("query_language", "unknown"),
-                metrics.get("hit_rate", 0.0),
-                metrics.get("mrr", 0.0),
-                metrics.get("context_precision", 0.0),
-                metrics.get("faithfulness", 0.0),
-                metrics.get("answer_relevancy", 0.0),
-                metrics.get("response_time", 0.0),
-                metrics.get("retrieved_docs_count", 0),
-            ])
+        self._csv_row(self._csv_paths["evaluation_results"], EVALUATION_RESULTS_HEADER, [
+            self._now_str(),
+            query,
+            metrics.get("query_language", "unknown"),
+            metrics.get("hit_rate", 0.0),
+            metrics.get("mrr", 0.0),
+            metrics.get("context_precision", 0.0),
+            metrics.get("faithfulness", 0.0),
+            metrics.get("answer_relevancy", 0.0),
+            metrics.get("response_time", 0.0),
+            metrics.get("retrieved_docs_count", 0),
+        ])
         self.stats["evaluation"]["queries_tested"] += 1
 
     # ---------- perf ----------
 
-    def log_performance_snapshot(self, stage: str, cpu_percent: float, memory_mb: float, gpu_memory_mb: float = 0.0):
+    def _sys_snapshot(self) -> Dict[str, float]:
+        """Latest cached system sample (empty if psutil is unavailable)."""
+        if not PSUTIL_AVAILABLE:
+            return {}
+        if getattr(self, "_sampler", None) is None:
+            self._sampler = _SysSampler()
+        return self._sampler.snapshot()
+
+    def log_performance_snapshot(
+        self,
+        stage: str,
+        cpu_percent: Optional[float] = None,
+        memory_mb: Optional[float] = None,
+        gpu_memory_mb: float = 0.0,
+    ):
+        """CPU/RAM default to the background sampler's cached values when not given."""
+        if cpu_percent is None or memory_mb is None:
+            sample = self._sys_snapshot()
+            if cpu_percent is None:
+                cpu_percent = sample.get("cpu_percent", 0.0)
+            if memory_mb is None:
+                memory_mb = sample.get("memory_used_mb", 0.0)
         self.performance_logger.info(
             f"📈 {stage} | CPU:{cpu_percent:.1f}% | RAM:{memory_mb:.1f}MB | GPU:{gpu_memory_mb:.1f}MB"
         )
-        path = self.logs_root / "performance" / "system_performance.csv"
-        new_file = not path.exists()
-        with path.open("a", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            if new_file:
-                w.writerow(["timestamp", "stage", "cpu_percent", "memory_mb", "gpu_memory_mb"])
-            w.writerow([datetime.now().isoformat(), stage, cpu_percent, memory_mb, gpu_memory_mb])
+        self._csv_row(
+            self._csv_paths["system_performance"], SYSTEM_PERFORMANCE_HEADER,
+            [self._now_str(), stage, cpu_percent, memory_mb, gpu_memory_mb],
+        )
 
     # ---------- summary ----------
 
     def generate_session_summary(self) -> Dict[str, Any]:
+        self.close()
+        self._drain_log_queue()
         gpu_ok = TORCH_AVAILABLE and bool(getattr(torch, "cuda", None)) and torch.cuda.is_available()  # type: ignore
         summary = {
             "session_id": self.session_id,
@@ -220,8 +499,7 @@ class ComprehensiveRAGLogger:
             },
         }
 
-        with (self.logs_root / "session_summary.json").open("w", encoding="utf-8") as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        _write_json(self.logs_root / "session_summary.json", summary)
 
         self._write_markdown_report(summary)
         return summary
@@ -271,10 +549,65 @@ class ComprehensiveRAGLogger:
 
 
 # Singleton accessor
-_rag_logger_singleton: Optional[ComprehensiveRAGLogger] = None
+class _NullRAGLogger:
+    """No-op stand-in for ComprehensiveRAGLogger when CFG.disable_file_logs is set
+    (no session directory, files, handlers or threads)."""
+
+    session_id: Optional[str] = None
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def log_error(self, component: str, message: str, exc: Optional[BaseException] = None):
+        pass
+
+    def log_ingestion_start(self, zip_count: int, total_size_mb: float):
+        pass
+
+    def log_pdf_processed(self, pdf_path: Path, pages_count: int, text_length: int, processing_time: float):
+        pass
+
+    def log_embedding_start(self, total_chunks: int, batch_size: int, gpu_enabled: bool):
+        pass
+
+    def log_embedding_batch(self, batch_id: int, chunk_count: int, processing_time: float, gpu_memory_mb: float, avg_norm: float):
+        pass
+
+    def log_ocr_start(self, files_for_ocr: int):
+        pass
+
+    def log_ocr_page(self, file_name: str, page_num: int, text_length: int, confidence: float, processing_time: float, success: bool):
+        pass
+
+    def log_evaluation_start(self, test_queries: int, metrics_used: List[str]):
+        pass
+
+    def log_evaluation_query(self, query: str, metrics: Dict[str, float]):
+        pass
+
+    def log_performance_snapshot(
+        self,
+        stage: str,
+        cpu_percent: Optional[float] = None,
+        memory_mb: Optional[float] = None,
+        gpu_memory_mb: float = 0.0,
+    ):
+        pass
+
+    def generate_session_summary(self) -> Dict[str, Any]:
+        return {}
+
+
+_rag_logger_singleton: Optional[Union[ComprehensiveRAGLogger, _NullRAGLogger]] = None
 
-def get_rag_logger() -> ComprehensiveRAGLogger:
+def get_rag_logger() -> Union[ComprehensiveRAGLogger, _NullRAGLogger]:
     global _rag_logger_singleton
     if _rag_logger_singleton is None:
-        _rag_logger_singleton = ComprehensiveRAGLogger()
+        if CFG.disable_file_logs:
+            _rag_logger_singleton = _NullRAGLogger()
+        else:
+            _rag_logger_singleton = ComprehensiveRAGLogger()
     return _rag_logger_singleton
@@ -1,20 +1,55 @@
 # core/qa.py
-from .config import CFG
+from .config import get_cfg
 from .search import search_dense, search_hybrid, rrf  # we'll fuse multi-query results via RRFom __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import json
+import os
 import re
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
 import fitz  # PyMuPDF
 
 from langdetect import detect
-from sentence_transformers import SentenceTransformer
-from qdrant_client import QdrantClient
 
-from .config import CFG
-from .search import search_dense, rrf  # we’ll fuse multi-query results via RRF
+from .config import get_cfg
+from .search import _client, _embedder, search_dense, search_dense_many, search_hybrid_many, rrf  # we’ll fuse multi-query results via RRF
+
+CFG = get_cfg()
+
+
+
+def _ollama_host(host: Optional[str]) -> str:
+    """
+    Base URL from an OLLAMA_HOST-style value, normalised like the ollama client:
+    "host", "host:port" and "scheme://host[:port]" forms; port 11434 unless a
+    scheme is given (then 80/443).
+    """
+    host = (host or "").strip()
+    scheme, _, hostport = host.partition("://")
+    port = 11434
+    if not hostport:
+        scheme, hostport = "http", host
+    elif scheme in ("http", "https"):
+        port = 443 if scheme == "https" else 80
+    split = urlsplit(f"{scheme}://{hostport}")
+    hostname = split.hostname or "127.0.0.1"
+    if ":" in hostname:
+        hostname = f"[{hostname}]"  # IPv6 literal
+    return f"{scheme}://{hostname}:{split.port or port}{split.path.rstrip('/')}"
+
+
+# Same environment variable the ollama package reads (remote/containerised servers)
+OLLAMA_HOST = _ollama_host(os.environ.get("OLLAMA_HOST"))
+
+# One keep-alive pool for the HTTP fallback instead of a new connection per answer
+_LLM_SESSION = requests.Session()
+_LLM_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_LLM_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
 
 # Optional reranker (BAAI/bge-reranker-v2-m3)
 try:
@@ -42,12 +77,11 @@ def _translate_to_de(text: str) -> str:
     Best-effort EN→DE translation via Ollama (qwen2.5). If unavailable, returns input.
     """
     try:
-        import ollama
         prompt = (
             "Übersetze exakt ins Deutsche. Erhalte Namen, Zahlen, Fachbegriffe. "
             "Nicht zusammenfassen oder umformulieren.\n\nTEXT:\n" + text + "\n\nDEUTSCH:"
         )
-        out = ollama.chat(model=CFG.llm_model, messages=[{"role": "user", "content": prompt}])
+        out = _ollama_client().chat(model=CFG.llm_model, messages=[{"role": "user", "content": prompt}])
         return out["message"]["content"].strip()
     except Exception:
         return text
@@ -59,9 +93,9 @@ def _assert_dims_match_once() -> None:
     Skips check if collection doesn't exist yet.
     """
     try:
-        m = SentenceTransformer(CFG.embed_model, trust_remote_code=True)
-        dim = m.get_sentence_embedding_dimension()
-        client = QdrantClient(url=CFG.qdrant_url)
+        # Same cached model/client the searches use: no second model load at import
+        dim = _embedder().get_sentence_embedding_dimension()
+        client = _client()
         
         # Check if collection exists before trying to access it
         if not client.collection_exists(CFG.qdrant_collection):
@@ -91,6 +125,12 @@ def _sp_to_hit(sp) -> Hit:
     return Hit(text=txt, score=float(sp.score or 0.0), payload=pl, page=page, source=src)
 
 
+@lru_cache(maxsize=2)
+def _reranker(model_name: str) -> "FlagReranker":
+    """Loaded once per model name; retrieve_candidates reuses it across queries."""
+    return FlagReranker(model_name, use_fp16=True)
+
+
 def _should_skip_rerank(query: str) -> bool:
     """
     Skip reranking for deterministic ID lookups (e.g., 8-digit DTAD-ID).
@@ -132,20 +172,32 @@ def retrieve_candidates(user_text: str, cfg=CFG, limit: Optional[int] = None) ->
         res = search_fn(de_q, limit)
     else:
         # Dual retrieval + RRF fusion
-        res_en = search_fn(user_text, limit)
-        de_q   = user_text if lang == "de" else _translate_to_de(user_text)
-        res_de = search_fn(de_q, limit)
-        res    = rrf([res_en, res_de])[:limit]
+        de_q = user_text if lang == "de" else _translate_to_de(user_text)
+        if de_q == user_text:
+            # Both legs would be the same search; fusing a list with itself keeps its order
+            res = search_fn(user_text, limit)
+        else:
+            # Both queries in one batched encode + Qdrant round-trip
+            search_many = search_hybrid_many if cfg.use_hybrid else search_dense_many
+            res_en, res_de = search_many([user_text, de_q], limit)
+            res = rrf([res_en, res_de])[:limit]
 
     hits = [_sp_to_hit(r) for r in res]
 
     # Optional reranking
     if cfg.use_rerank and _HAS_RERANKER and hits and not _should_skip_rerank(user_text):
         try:
-            reranker = FlagReranker(cfg.reranker_model, use_fp16=True)
+            reranker = _reranker(cfg.reranker_model)
             # make sure we have text for each item
             pairs = [(user_text, (h.text or h.payload.get("text", ""))[:1800]) for h in hits]
-            scores = reranker.compute_score(pairs, normalize=True)
+            scores = reranker.compute_score(
+                pairs,
+                batch_size=int(cfg.rerank_batch_size),
+                max_length=int(cfg.rerank_max_length),
+                normalize=True,
+            )
+            if not isinstance(scores, list):
+                scores = [scores]  # single pair comes back as a bare float
             blended: List[Tuple[float, Hit]] = []
             w = float(cfg.rerank_weight)
             for h, s in zip(hits, scores):
@@ -165,6 +217,20 @@ def answer_query(user_text: str, cfg=CFG) -> str:
     Minimal answerer: stitches snippets from top hits and asks the LLM.
     Replace with your preferred prompting if you want.
     """
+    prompt, num_predict = _build_prompt(user_text, cfg)
+    return _ask_llm(prompt, num_predict)
+
+
+def answer_query_stream(user_text: str, cfg=CFG) -> Iterator[str]:
+    """
+    Same as answer_query, but yields the answer in chunks as the LLM produces them.
+    """
+    prompt, num_predict = _build_prompt(user_text, cfg)
+    yield from _stream_llm(prompt, num_predict)
+
+
+def _build_prompt(user_text: str, cfg=CFG) -> Tuple[str, int]:
+    """Prompt for the LLM plus a token cap (short when there is no context to cite)."""
     hits = retrieve_candidates(user_text, cfg)
     blocks: List[str] = []
     for h in hits[: int(cfg.final_k)]:
@@ -185,7 +251,7 @@ def answer_query(user_text: str, cfg=CFG) -> str:
         "Sei präzise und nenne die Quelle in eckigen Klammern.\n\n"
         f"Kontext:\n{context}\n\nFrage: {user_text}\nAntwort:"
     )
-    return _ask_llm(prompt)
+    return prompt, (256 if blocks else 64)
 
 
 # ----------------------- PDF fallback & LLM bridge ---------------------------
@@ -201,44 +267,85 @@ def _load_pages_text(source_path: str, p_start: Optional[int], p_end: Optional[i
         if not p.exists():
             return f"[File not found: {Path(source_path).name}]"
 
-        with fitz.open(p) as doc:
-            p_start = max(1, int(p_start))
-            p_end = min(len(doc), int(p_end))
-            texts = []
-            for i in range(p_start - 1, p_end):
-                texts.append(doc[i].get_text() or "")
-            out = "\n".join(texts).strip()
-            return out[:max_chars] + ("..." if len(out) > max_chars else "")
+        return _read_pages(str(p), p.stat().st_mtime_ns, int(p_start), int(p_end), max_chars)
     except Exception as e:
         return f"[Error loading PDF: {e}]"
 
 
-def _ask_llm(prompt: str) -> str:
+@lru_cache(maxsize=256)
+def _read_pages(path: str, mtime_ns: int, p_start: int, p_end: int, max_chars: int) -> str:
+    """Clipped text of pages p_start..p_end; cached per file version (mtime_ns is part of the key)."""
+    with fitz.open(path) as doc:
+        p_start = max(1, p_start)
+        p_end = min(len(doc), p_end)
+        texts = []
+        for i in range(p_start - 1, p_end):
+            texts.append(doc[i].get_text() or "")
+        out = "\n".join(texts).strip()
+        return out[:max_chars] + ("..." if len(out) > max_chars else "")
+
+
+@lru_cache(maxsize=1)
+def _ollama_client():
+    """Ollama client reused across calls (keeps its HTTP connection alive)."""
+    import ollama
+    return ollama.Client(host=OLLAMA_HOST)
+
+
+def _ask_llm(prompt: str, num_predict: int = 256) -> str:
     """LLM call with Ollama client first, then HTTP fallback."""
+    return "".join(_stream_llm(prompt, num_predict)).strip() or "[LLM returned empty response]"
+
+
+def _stream_llm(prompt: str, num_predict: int = 256) -> Iterator[str]:
+    """Streaming LLM call with Ollama client first, then HTTP fallback."""
+    sent = False
     # Try Ollama Python client
     try:
-        import ollama
-        response = ollama.chat(
+        stream = _ollama_client().chat(
             model=CFG.llm_model,
             messages=[{"role": "user", "content": prompt}],
-            options={"num_predict": 256, "temperature": 0.2, "top_p": 0.9},
+            options={"num_predict": num_predict, "temperature": 0.2, "top_p": 0.9},
+            stream=True,
         )
-        return response["message"]["content"].strip()
+        for part in stream:
+            piece = part["message"]["content"]
+            if piece:
+                sent = True
+                yield piece
+        return
     except Exception as ollama_error:
-        # Fallback to direct HTTP API
-        try:
-            body = {
-                "model": CFG.llm_model,
-                "prompt": prompt,
-                "options": {"num_predict": 256, "temperature": 0.2},
-                "stream": False,
-            }
-            r = requests.post("http://localhost:11434/api/generate", json=body, timeout=60)
+        if sent:
+            # Answer was already partly delivered; don't restart it over HTTP
+            yield f" [LLM stream interrupted: {ollama_error}]"
+            return
+        client_error = ollama_error
+
+    # Fallback to direct HTTP API
+    try:
+        body = {
+            "model": CFG.llm_model,
+            "prompt": prompt,
+            "options": {"num_predict": num_predict, "temperature": 0.2},
+            "stream": True,
+        }
+        with _LLM_SESSION.post(f"{OLLAMA_HOST}/api/generate", json=body, stream=True, timeout=60) as r:
             r.raise_for_status()
-            data = r.json()
-            return (data.get("response") or "").strip() or "[LLM returned empty response]"
-        except Exception as api_error:
-            return (
-                f"[LLM unavailable - Ollama: {ollama_error}, API: {api_error}] "
-                "Based on the context, I found relevant documents but cannot generate an answer."
-            )
+            for line in r.iter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                piece = data.get("response") or ""
+                if piece:
+                    sent = True
+                    yield piece
+                if data.get("done"):
+                    break
+    except Exception as api_error:
+        if sent:
+            yield f" [LLM stream interrupted: {api_error}]"
+            return
+        yield (
+            f"[LLM unavailable - Ollama: {client_error}, API: {api_error}] "
+            "Based on the context, I found relevant documents but cannot generate an answer."
+        )
@@ -1,6 +1,8 @@
 # core/search.py
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
 from functools import lru_cache
 from typing import Dict, List, Optional, Sequence, Tuple
 
@@ -9,11 +11,18 @@ from qdrant_client import QdrantClient
 from qdrant_client.http import models as qmodels
 from sentence_transformers import SentenceTransformer
 
-from .config import CFG
+from .config import get_cfg
+
+CFG = get_cfg()
 
 # Keep embedder behavior stable if HF repo updates
 PINNED_SHA = "f1944de8402dcd5f2b03f822a4bc22a7f2de2eb9"
 
+# Query text -> cropped float32 vector, most recently used last
+QUERY_CACHE_SIZE = 1024
+_query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_query_cache_lock = threading.Lock()
+
 
 # ---------------------------------------------------------------------------
 # Singletons
@@ -21,8 +30,13 @@ PINNED_SHA = "f1944de8402dcd5f2b03f822a4bc22a7f2de2eb9"
 
 @lru_cache(maxsize=1)
 def _client() -> QdrantClient:
-    # prefer_grpc=False for widest compatibility on Windows
-    return QdrantClient(url=CFG.qdrant_url, prefer_grpc=False, timeout=60.0)
+    # HTTP by default for widest compatibility on Windows; RAGBOT_QDRANT_PREFER_GRPC=1 switches to gRPC
+    return QdrantClient(
+        url=CFG.qdrant_url,
+        prefer_grpc=CFG.qdrant_prefer_grpc,
+        grpc_port=CFG.qdrant_grpc_port,
+        timeout=60.0,
+    )
 
 
 @lru_cache(maxsize=1)
@@ -36,12 +50,29 @@ def _embedder() -> SentenceTransformer:
     except Exception:
         device = "cpu"
 
-    return SentenceTransformer(
+    model = SentenceTransformer(
         CFG.embed_model,
         trust_remote_code=True,
         revision=PINNED_SHA,
         device=device,
     )
+    if device == "cpu" and CFG.embed_query_int8:
+        model = _quantize_int8(model)
+    return model
+
+
+def _quantize_int8(model: SentenceTransformer) -> SentenceTransformer:
+    """Dynamic INT8 quantization of the encoder's Linear layers (CPU query path only)."""
+    try:
+        import torch
+        first = model._first_module()
+        first.auto_model = torch.quantization.quantize_dynamic(
+            first.auto_model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+    except Exception as e:
+        import logging
+        logging.getLogger("core.search").warning(f"INT8 quantization skipped, using FP32: {e}")
+    return model
 
 
 @lru_cache(maxsize=1)
@@ -89,6 +120,44 @@ def _select_vector_name() -> Optional[str]:
     return "text" if "text" in sizes else next(iter(sizes.keys()))
 
 
+_search_params_ok = True  # cleared if the server rejects SearchParams
+
+
+def _params_rejected(e: Exception) -> bool:
+    """
+    True if `e` is the server/client refusing the request itself (HTTP 400/422,
+    gRPC INVALID_ARGUMENT, model validation), not a timeout or connection error.
+    """
+    from pydantic import ValidationError
+    from qdrant_client.http.exceptions import UnexpectedResponse
+    if isinstance(e, ValidationError):
+        return True
+    if isinstance(e, UnexpectedResponse):
+        return e.status_code in (400, 422)
+    try:
+        import grpc
+        if isinstance(e, grpc.RpcError):
+            return e.code() == grpc.StatusCode.INVALID_ARGUMENT
+    except ImportError:
+        pass
+    return False
+
+
+def _search_params(limit: int) -> qmodels.SearchParams:
+    """
+    HNSW ef scaled with the requested candidates (at least CFG.hnsw_ef_search,
+    2x limit, capped at 512). On int8-quantized collections the search runs
+    on the quantized vectors with 2x oversampling, rescored with the originals;
+    servers ignore the quantization part for unquantized collections.
+    """
+    ef = min(512, max(int(CFG.hnsw_ef_search), 2 * limit))
+    return qmodels.SearchParams(
+        hnsw_ef=ef,
+        exact=False,
+        quantization=qmodels.QuantizationSearchParams(ignore=False, rescore=True, oversampling=2.0),
+    )
+
+
 def _effective_model_dim() -> int:
     try:
         return int(_embedder().get_sentence_embedding_dimension())
@@ -113,14 +182,6 @@ def _ensure_dims_ok() -> None:
         )
 
 
-def _vector_arg(vec: Sequence[float]):
-    """
-    Build the 'query_vector' argument for Qdrant .search(), supporting single and named vectors.
-    """
-    name = _select_vector_name()
-    return vec if name is None else (name, vec)
-
-
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -130,18 +191,40 @@ def embed_query(text: str) -> List[float]:
     Encode a user query with the Jina v3 query prefix and return a float list.
     Auto-slices to the collection's vector size if needed.
     """
-    prefix = getattr(CFG, "embed_query_prefix", "search_query: ")
-    embs = _embedder().encode(
-        [prefix + text],
-        normalize_embeddings=True,
-        convert_to_numpy=True,
-    )
-    v: np.ndarray = embs[0].astype("float32", copy=False)
+    return embed_queries([text])[0]
 
-    qdim = _qdrant_dim()
-    if qdim is not None and v.shape[0] > qdim:
-        v = v[:qdim]
-    return v.tolist()
+
+def embed_queries(texts: Sequence[str]) -> List[List[float]]:
+    """
+    Batched embed_query: one forward pass for all `texts` not already in the
+    query-vector LRU (repeat queries skip the encoder entirely).
+    """
+    with _query_cache_lock:
+        vecs: Dict[str, np.ndarray] = {}
+        for t in texts:
+            v = _query_cache.get(t)
+            if v is not None:
+                _query_cache.move_to_end(t)
+                vecs[t] = v
+    misses = [t for t in dict.fromkeys(texts) if t not in vecs]
+    if misses:
+        prefix = getattr(CFG, "embed_query_prefix", "search_query: ")
+        embs: np.ndarray = _embedder().encode(
+            [prefix + t for t in misses],
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            batch_size=32,
+        ).astype("float32", copy=False)
+
+        qdim = _qdrant_dim()
+        if qdim is not None and embs.shape[1] > qdim:
+            embs = embs[:, :qdim]
+        with _query_cache_lock:
+            for t, v in zip(misses, embs):
+                vecs[t] = _query_cache[t] = v
+            while len(_query_cache) > QUERY_CACHE_SIZE:
+                _query_cache.popitem(last=False)
+    return [vecs[t].tolist() for t in texts]
 
 
 def search_dense(query_text: str, limit: Optional[int] = None, min_score: Optional[float] = None):
@@ -149,27 +232,50 @@ def search_dense(query_text: str, limit: Optional[int] = None, min_score: Option
     Dense vector search against the configured collection.
     Returns: list[qdrant_client.models.ScoredPoint].
     """
+    return search_dense_many([query_text], limit=limit, min_score=min_score)[0]
+
+
+def search_dense_many(query_texts: Sequence[str], limit: Optional[int] = None, min_score: Optional[float] = None):
+    """
+    search_dense for several queries: one batched encode and one search_batch
+    round-trip. Returns one ScoredPoint list per query, in input order.
+    """
+    global _search_params_ok
     _ensure_dims_ok()
     limit = int(limit or getattr(CFG, "topk_candidate", 100))
-    qv = embed_query(query_text)
+    name = _select_vector_name()
+    params = _search_params(limit) if _search_params_ok else None
+
+    def _requests(params):
+        return [
+            qmodels.SearchRequest(
+                vector=qv if name is None else qmodels.NamedVector(name=name, vector=qv),
+                limit=limit,
+                params=params,
+                with_payload=True,
+                with_vector=False,
+                score_threshold=None,  # post-filter below
+            )
+            for qv in vectors
+        ]
 
-    # Note: 'params' argument removed for compatibility with Qdrant 1.9.2
-    # In newer versions, you can add: params=qmodels.SearchParams(hnsw_ef=128)
-    
-    res = _client().search(
-        collection_name=CFG.qdrant_collection,
-        query_vector=_vector_arg(qv),
-        limit=limit,
-        with_payload=True,
-        with_vectors=False,
-        score_threshold=None,  # post-filter below
-    )
+    vectors = embed_queries(query_texts)
+    try:
+        results = _client().search_batch(collection_name=CFG.qdrant_collection, requests=_requests(params))
+    except Exception as e:
+        if params is None or not _params_rejected(e):
+            raise  # transient errors (timeouts, resets) keep the params for later calls
+        # Older servers/clients (e.g. Qdrant 1.9.2 setups) may reject search params: drop them for good
+        import logging
+        logging.getLogger("core.search").warning(f"Search params rejected, searching without them: {e}")
+        results = _client().search_batch(collection_name=CFG.qdrant_collection, requests=_requests(None))
+        _search_params_ok = False  # only once the plain request went through
 
     # Optional post-filter by score
     thresh = float(getattr(CFG, "min_score", 0.0)) if min_score is None else float(min_score)
     if thresh > 0:
-        res = [r for r in res if (r.score is not None and float(r.score) >= thresh)]
-    return res
+        results = [[r for r in res if (r.score is not None and float(r.score) >= thresh)] for res in results]
+    return results
 
 
 def rrf(result_sets: List[Sequence], k: int = 60):
@@ -201,67 +307,82 @@ def search_hybrid(query_text: str, limit: Optional[int] = None, dense_weight: fl
     Returns:
         List of fused ScoredPoint objects, sorted by fused score
     """
-    from .hybrid_search import search_bm25, reciprocal_rank_fusion
-    
+    return search_hybrid_many([query_text], limit=limit, dense_weight=dense_weight)[0]
+
+
+def search_hybrid_many(query_texts: Sequence[str], limit: Optional[int] = None, dense_weight: float = 0.7):
+    """
+    search_hybrid for several queries; the dense half is batched
+    (search_dense_many), BM25 runs per query. One fused list per query.
+    """
     _ensure_dims_ok()
     limit = int(limit or getattr(CFG, "topk_candidate", 100))
     
-    # 1. Dense vector search
-    dense_results = search_dense(query_text, limit=limit)
+    # 1. Dense vector search (all queries at once)
+    dense_sets = search_dense_many(query_texts, limit=limit)
+    
+    fused = []
+    for query_text, dense_results in zip(query_texts, dense_sets):
+        # 2. BM25 sparse search
+        bm25_results = _bm25_points(query_text, limit)
+        
+        # 3. Fusion with RRF
+        if not bm25_results:
+            # No BM25 results, return dense only
+            fused.append(dense_results[:limit])
+            continue
+        
+        # Use RRF to fuse both result sets
+        fused.append(rrf([dense_results, bm25_results], k=60)[:limit])
+    return fused
+
+
+def _bm25_points(query_text: str, limit: int) -> list:
+    """BM25 hits for `query_text` as ScoredPoint-like objects, in BM25 rank order ([] on failure)."""
+    from .hybrid_search import search_bm25
     
-    # 2. BM25 sparse search
     try:
-        bm25_results_raw = search_bm25(query_text, top_k=limit)
+        # doc_id -> score in BM25 rank order (single pass over the hits)
+        bm25_scores = dict(search_bm25(query_text, top_k=limit))
         
         # Convert BM25 results (doc_id, score) to match Qdrant point IDs
         # We need to fetch the actual points from Qdrant for the BM25 hits
-        bm25_doc_ids = [doc_id for doc_id, _ in bm25_results_raw]
+        bm25_doc_ids = list(bm25_scores)
         
-        if bm25_doc_ids:
-            # Fetch points by ID from Qdrant
-            from qdrant_client.http import models as qmodels
-            bm25_points = _client().retrieve(
-                collection_name=CFG.qdrant_collection,
-                ids=bm25_doc_ids,
-                with_payload=True,
-                with_vectors=False,
-            )
-            
-            # Create a lookup for BM25 scores
-            bm25_scores = {doc_id: score for doc_id, score in bm25_results_raw}
-            
-            # Create ScoredPoint-like objects for BM25 results
-            # We'll create a simple class to mimic ScoredPoint structure
-            class BM25ScoredPoint:
-                def __init__(self, point, bm25_score):
-                    self.id = point.id
-                    self.score = bm25_score
-                    self.payload = point.payload
-                    self.version = getattr(point, 'version', None)
-            
-            bm25_results = [
-                BM25ScoredPoint(point, bm25_scores.get(str(point.id), 0.0))
-                for point in bm25_points
-            ]
-        else:
-            bm25_results = []
+        if not bm25_doc_ids:
+            return []
+        
+        # Fetch points by ID from Qdrant
+        bm25_points = _client().retrieve(
+            collection_name=CFG.qdrant_collection,
+            # BM25 keeps ids as strings; integer point ids must go back as ints
+            ids=[int(i) if i.isdigit() else i for i in bm25_doc_ids],
+            with_payload=True,
+            with_vectors=False,
+        )
+        # retrieve() does not guarantee input order; RRF needs BM25 rank order
+        bm25_points.sort(key=lambda p: bm25_scores.get(str(p.id), 0.0), reverse=True)
+        
+        # Create ScoredPoint-like objects for BM25 results
+        # We'll create a simple class to mimic ScoredPoint structure
+        class BM25ScoredPoint:
+            def __init__(self, point, bm25_score):
+                self.id = point.id
+                self.score = bm25_score
+                self.payload = point.payload
+                self.version = getattr(point, 'version', None)
+        
+        return [
+            BM25ScoredPoint(point, bm25_scores.get(str(point.id), 0.0))
+            for point in bm25_points
+        ]
     
     except Exception as e:
         # If BM25 fails, fall back to dense-only
         import logging
         logger = logging.getLogger("core.search")
         logger.warning(f"BM25 search failed, using dense-only: {e}")
-        bm25_results = []
-    
-    # 3. Fusion with RRF
-    if not bm25_results:
-        # No BM25 results, return dense only
-        return dense_results[:limit]
-    
-    # Use RRF to fuse both result sets
-    fused_results = rrf([dense_results, bm25_results], k=60)
-    
-    return fused_results[:limit]
+        return []
 
 
 def count_points() -> Optional[int]: